@@ -253,16 +253,18 @@ def split_sequences(
     if partitions is None:
         partitions = datapack.min_abs_diff_partition(seqlens, n_dp, min_size)
 
-    batch_sizes = [end - start for start, end in partitions]
-
     # These are used by log probabilities, which are one-step shorter than packed inputed ids.
-    # We use numpy/list for indexing to avoid host-device synchronization
-    batch_seqlens = [sum(seqlens[start:end]) for start, end in partitions]
-    offsets = [0] + np.cumsum(batch_seqlens).tolist()[:-1]
-    short1batch_seqlens = [
-        sum(seqlens[start:end]) - (end - start) for start, end in partitions
-    ]
-    short1offsets = [0] + np.cumsum(short1batch_seqlens).tolist()[:-1]
+    # We use numpy/list for indexing to avoid host-device synchronization.
+    # Per-partition sums are cumsum lookups instead of Python-level slice sums.
+    part_arr = np.asarray(partitions, dtype=np.int64)
+    starts, ends = part_arr[:, 0], part_arr[:, 1]
+    cum_seqlens = np.concatenate(([0], np.cumsum(seqlens)))
+    batch_sizes_arr = ends - starts
+    batch_sizes = batch_sizes_arr.tolist()
+    batch_seqlens = cum_seqlens[ends] - cum_seqlens[starts]
+    offsets = np.concatenate(([0], np.cumsum(batch_seqlens)[:-1]))
+    short1batch_seqlens = batch_seqlens - batch_sizes_arr
+    short1offsets = np.concatenate(([0], np.cumsum(short1batch_seqlens)[:-1]))
 
     splitted_data = [collections.defaultdict() for _ in range(n_dp)]
     for k, v in src.items():
@@ -409,7 +411,10 @@ def get_shape_from_key_and_seqlen(k: str, seqlen: int, vocab_size: int):
     ]:
         shape = (seqlen - 1,)
     elif k in ["logits_mask", "packed_logits_mask"]:
-        shape = (seqlen, vocab_size)
+        # The logits mask travels bit-packed along the vocab axis
+        # (8 entries per byte); see
+        # realhf.impl.model.utils.functional.pack_logits_mask.
+        shape = (seqlen, (vocab_size + 7) // 8)
     else:
         raise NotImplementedError(f"Unknown key {k} in packed data.")
     return shape
@@ -420,10 +425,14 @@ def get_dtype_from_key(k: str):
         "seq_no_eos_mask",
         "ppo_loss_mask",
         "prompt_mask",
+    ]:
+        dtype = torch.bool
+    elif k in [
         "logits_mask",
         "packed_logits_mask",
     ]:
-        dtype = torch.bool
+        # Bit-packed; see get_shape_from_key_and_seqlen.
+        dtype = torch.uint8
     elif k in [
         "reward_score",
         "packed_ref_logprobs",
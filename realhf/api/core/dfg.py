@@ -140,6 +140,10 @@ class MFCDef:
     def __post_init__(self):
         if isinstance(self.model_name, str):
             self.model_name = ModelName(self.model_name, 0)
+        # Data keys may be given as (shared, module-level) tuples.
+        # Coerce them here so that each MFCDef owns mutable lists.
+        self.input_data = list(self.input_data)
+        self.output_data = list(self.output_data)
         assert isinstance(self.model_name, ModelName)
         if self.min_n_seqs > self.max_n_seqs:
             raise RuntimeError("Invalid min/max n_seqs.")
@@ -236,21 +236,21 @@ def device_mesh_name_from_mapping(global_mesh_name: str, mapping: np.ndarray):
 def find_parallel_strategies(
     device_mesh: DeviceMesh,
 ) -> List[ParallelismConfig]:
-    n_gpus = np.sum(device_mesh.mapping)
+    n_gpus = int(np.sum(device_mesh.mapping))
     res = []
-    for num_mp in [1, 2, 4, 8]:
-        if n_gpus >= num_mp:
-            assert n_gpus % num_mp == 0
-            num_dp_pp = n_gpus // num_mp
-            num_pp = 1
-            while num_pp <= num_dp_pp:
-                num_dp_mp = n_gpus // num_pp
-                valid = (
-                    num_dp_mp in [1, 2, 4, 8] or num_dp_mp % 8 == 0
-                ) and num_dp_pp % num_pp == 0
-                if valid:
-                    res.append(ParallelismConfig(num_pp, num_mp, num_dp_pp // num_pp))
-                num_pp += 1
+    for num_mp in (1, 2, 4, 8):
+        # Skip invalid (num_mp, num_pp) combinations before constructing
+        # anything, instead of validating each candidate after the fact.
+        if num_mp > n_gpus or n_gpus % num_mp != 0:
+            continue
+        num_dp_pp = n_gpus // num_mp
+        for num_pp in range(1, num_dp_pp + 1):
+            if num_dp_pp % num_pp != 0:
+                continue
+            num_dp_mp = n_gpus // num_pp
+            if num_dp_mp not in (1, 2, 4, 8) and num_dp_mp % 8 != 0:
+                continue
+            res.append(ParallelismConfig(num_pp, num_mp, num_dp_pp // num_pp))
     return res
 
 
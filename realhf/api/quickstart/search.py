@@ -6,7 +6,9 @@ from realhf.api.quickstart.device_mesh import DeviceMesh
 from realhf.api.quickstart.model import ParallelismConfig
 
 
-@dataclasses.dataclass
+# The search engine materializes these records in bulk (one per feasible
+# execution/per graph node), so give them slots to cut per-instance memory.
+@dataclasses.dataclass(slots=True)
 class RPCExecution:
     rpc: MFCDef
     device_mesh: DeviceMesh
@@ -29,7 +31,7 @@ class RPCExecution:
         )
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class RPCInstance:
     rpc: MFCDef
     iteration_id: int
@@ -4,7 +4,7 @@ import numba
 import numpy as np
 
 
-@numba.njit
+@numba.njit(cache=True)
 def ffd_check(a: np.ndarray, c: int, n: int) -> bool:
     """Check if a[] could fit in n bins with capacity c.
 
@@ -38,7 +38,7 @@ def ffd_check(a: np.ndarray, c: int, n: int) -> bool:
     return True
 
 
-@numba.njit
+@numba.njit(cache=True)
 def ffd_with_result(a: np.ndarray, c: int) -> List[List[int]]:
     """First-fit-decreasing bin packing.
 
@@ -73,7 +73,7 @@ def ffd_with_result(a: np.ndarray, c: int) -> List[List[int]]:
     return bins_result
 
 
-@numba.njit
+@numba.njit(cache=True)
 def ffd_with_result_unsorted(a: np.ndarray, c: int) -> List[List[int]]:
     """First-fit-decreasing bin packing.
 
@@ -102,7 +102,7 @@ def ffd_with_result_unsorted(a: np.ndarray, c: int) -> List[List[int]]:
     return bins_result
 
 
-@numba.njit
+@numba.njit(cache=True)
 def allocate(
     lengths: np.ndarray,
     lengths_cumsum: np.ndarray,
@@ -160,7 +160,7 @@ def allocate(
     return result
 
 
-@numba.njit
+@numba.njit(cache=True)
 def partition_balanced(nums: np.ndarray, k: int, min_size: int = 1):
     """Partition an array into k subarrays with a minimum absolute difference of sums and minimum subarray size.
 
@@ -223,6 +223,39 @@ def partition_balanced_tuples(
     return [(lst[i], lst[i + 1]) for i in range(k)]
 
 
+@numba.njit(cache=True)
+def _lpt_assign(nums: np.ndarray, k: int) -> np.ndarray:
+    order = np.argsort(nums)[::-1]
+    bin_sums = np.zeros(k, dtype=np.int64)
+    assignment = np.empty(len(nums), dtype=np.int64)
+    for idx in order:
+        b = np.argmin(bin_sums)
+        bin_sums[b] += nums[idx]
+        assignment[idx] = b
+    return assignment
+
+
+def ffd_partition(nums: Union[np.ndarray, List], k: int) -> List[List[int]]:
+    """Partition indices into k bins, minimizing the maximum bin sum.
+
+    First-fit-decreasing onto a fixed number of bins (a.k.a. the
+    longest-processing-time greedy): items are assigned in decreasing
+    order to the currently smallest bin. Unlike
+    :func:`min_abs_diff_partition`, the returned bins hold sorted but
+    non-contiguous indices, which allows a much better balance for
+    long-tailed sequence length distributions. Every bin is non-empty
+    as long as ``len(nums) >= k`` and all entries are positive.
+    """
+    if isinstance(nums, list):
+        nums = np.array(nums)
+    if len(nums) < k:
+        raise ValueError(
+            f"The array to be partitioned must have length >= k. (array {nums}, k={k})"
+        )
+    assignment = _lpt_assign(nums.astype(np.int64), k)
+    return [np.nonzero(assignment == i)[0].tolist() for i in range(k)]
+
+
 def min_abs_diff_partition(
     arr: Union[np.ndarray, List], k: int, min_size: int = 1
 ) -> List[Tuple[int]]:
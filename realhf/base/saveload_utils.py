@@ -1,40 +1,45 @@
+import concurrent.futures
+import itertools
 import os
 import shutil
-from typing import Dict
+from typing import Container, Dict, List, Optional
 
+import numpy as np
 import torch
-import tqdm
 from safetensors import safe_open
+from safetensors.torch import save_file
 
 from realhf.base import logging
+from realhf.base.datapack import partition_balanced
 
 logger = logging.getLogger("SaveLoad")
 
 
-def split_state_dict_into_shards(state_dict: Dict, n_shards: int) -> Dict:
+def split_state_dict_into_shards(state_dict: Dict, n_shards: int) -> List[Dict]:
     if n_shards == 1:
         return [state_dict]
 
-    keys = list(state_dict.keys())
-    if len(keys) < n_shards:
-        raise ValueError(f"state_dict has {len(keys)} keys, but n_shards={n_shards}")
-
-    shard_size = len(keys) // n_shards
-    extra = len(keys) % n_shards
-    shard_size_list = [shard_size for _ in range(n_shards)]
-    shard_size_list[-1] = shard_size + extra
-    start, shards = 0, []
-    for i, size in enumerate(
-        tqdm.tqdm(
-            shard_size_list,
-            desc=f"Splitting state dict into {len(shard_size_list)} shards...",
+    if len(state_dict) < n_shards:
+        raise ValueError(
+            f"state_dict has {len(state_dict)} keys, but n_shards={n_shards}"
         )
-    ):
-        shard = {}
-        for j in range(start, start + size):
-            shard[keys[j]] = state_dict[keys[j]]
-        start += size
-        shards.append(shard)
+
+    # Balance shards by byte size rather than key count: a key-count
+    # split puts the embedding or LM head (orders of magnitude heavier
+    # than a layer norm) into arbitrary shards and skews both write and
+    # concurrent load times. Keys stay in order, so each shard is a
+    # contiguous slice of the items.
+    sizes = np.array(
+        [v.numel() * v.element_size() for v in state_dict.values()],
+        dtype=np.int64,
+    )
+    bounds = partition_balanced(nums=sizes, k=n_shards)
+    items = iter(state_dict.items())
+    shards = [
+        dict(itertools.islice(items, bounds[i + 1] - bounds[i]))
+        for i in range(n_shards)
+    ]
+    logger.debug(f"Split state dict into {n_shards} shards.")
     return shards
 
 
@@ -50,7 +55,10 @@ HF_MODEL_CONFIG_FILES = [
 
 
 def copy_hf_configs(src_model_dir, dst_model_dir):
-    for file in HF_MODEL_CONFIG_FILES:
+    # The files are tiny, so per-file open latency dominates on
+    # distributed filesystems; copying them concurrently pays that
+    # latency once instead of seven times.
+    def _copy_one(file):
         try:
             shutil.copy(
                 os.path.join(src_model_dir, file),
@@ -60,11 +68,47 @@ def copy_hf_configs(src_model_dir, dst_model_dir):
         except FileNotFoundError:
             logger.info(f"{file} not exist in {src_model_dir} skipping.")
 
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(HF_MODEL_CONFIG_FILES)
+    ) as ex:
+        list(ex.map(_copy_one, HF_MODEL_CONFIG_FILES))
+
+
+def save_safetensor(state_dict: Dict[str, torch.Tensor], fn: str):
+    assert fn.endswith(".safetensors")
+    # safetensors serializes tensor buffers as-is and requires them to be
+    # contiguous; merged MP shards occasionally are not.
+    state_dict = {
+        k: v if v.is_contiguous() else v.contiguous() for k, v in state_dict.items()
+    }
+    # The format marker is part of the HF safetensors convention;
+    # transformers refuses headerless files in some load paths.
+    save_file(state_dict, fn, metadata={"format": "pt"})
+    # Checkpoint bytes are write-once and never reread by this process;
+    # telling the kernel to drop them keeps multi-GB saves from
+    # evicting pages that are actually hot (e.g., mmap'd source
+    # weights or the dataset cache).
+    if hasattr(os, "posix_fadvise"):
+        fd = os.open(fn, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def load_safetensor(
+    fn: str, keys: Optional[Container[str]] = None
+) -> Dict[str, torch.Tensor]:
+    """Load tensors from a safetensors file, optionally restricted to `keys`.
 
-def load_safetensor(fn: str) -> Dict[str, torch.Tensor]:
+    safe_open only reads the bytes of the tensors actually fetched, so
+    passing the required key set skips the rest of the file instead of
+    loading the whole checkpoint into host RAM and filtering afterwards.
+    """
     assert fn.endswith(".safetensors")
     state_dict = {}
     with safe_open(fn, framework="pt", device="cpu") as f:
         for key in f.keys():
-            state_dict[key] = f.get_tensor(key)
+            if keys is None or key in keys:
+                state_dict[key] = f.get_tensor(key)
     return state_dict
@@ -100,16 +100,40 @@ class EpochStepTimeFreqCtl:
     freq_sec: int
 
     def __post_init__(self):
-        self.epoch_ctl = FrequencyControl(frequency_steps=self.freq_epoch)
-        self.step_ctl = FrequencyControl(frequency_steps=self.freq_step)
-        self.time_ctl = FrequencyControl(frequency_seconds=self.freq_sec)
+        # Plain integer counters instead of three FrequencyControl
+        # instances: this check runs on the master's hot post-step path,
+        # where delegating would take three locks and read the clock for
+        # each sub-condition.
+        self._epochs = 0
+        self._steps = 0
+        self._last_epochs = 0
+        self._last_steps = 0
+        self._last_time = time.monotonic()
 
     def check(self, epochs: int, steps: int):
-        x, y, z = (
-            self.epoch_ctl.check(epochs),
-            self.step_ctl.check(steps),
-            self.time_ctl.check(),
+        now = time.monotonic()
+        self._epochs += epochs
+        self._steps += steps
+        # Each condition keeps its own reset point, matching the
+        # independent sub-controllers this replaces.
+        x = (
+            self.freq_epoch is not None
+            and self._epochs - self._last_epochs >= self.freq_epoch
         )
+        y = (
+            self.freq_step is not None
+            and self._steps - self._last_steps >= self.freq_step
+        )
+        z = (
+            self.freq_sec is not None
+            and now - self._last_time >= self.freq_sec
+        )
+        if x:
+            self._last_epochs = self._epochs
+        if y:
+            self._last_steps = self._steps
+        if z:
+            self._last_time = now
         return x or y or z
 
 
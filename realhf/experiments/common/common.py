@@ -170,7 +170,11 @@ class CommonExperimentConfig(Experiment):
         return DeviceMesh(
             n_nodes=self.n_nodes,
             n_gpus_per_node=self.n_gpus_per_node,
-            mapping=np.ones((self.n_nodes, self.n_gpus_per_node), dtype=np.int32),
+            # A zero-byte read-only view: every entry of the global mesh is 1,
+            # so there is no need to materialize a fresh buffer per access.
+            mapping=np.broadcast_to(
+                np.int32(1), (self.n_nodes, self.n_gpus_per_node)
+            ),
             global_mesh_name=self.nodelist,
             name=self.nodelist,
         )
@@ -302,52 +306,72 @@ class CommonExperimentConfig(Experiment):
         for rpc_alloc in rpc_allocs:
             model_name_to_rpc_allocs[rpc_alloc.rpc.model_name].append(rpc_alloc)
 
+        # Model/topology/backend configurations are identical for every shard
+        # of the same model, so build them once and share them across workers
+        # instead of reconstructing them inside the per-GPU loop below.
+        model_name_to_setup = {}
+        for (
+            model_name,
+            model_rpc_allocs,
+        ) in model_name_to_rpc_allocs.items():
+            model_rpcs = [rpc_alloc.rpc for rpc_alloc in model_rpc_allocs]
+            rpc_alloc = model_rpc_allocs[0]
+            model_cfg = self.models[model_name.role]
+            model = make_model_config(model_cfg)
+            mapping = rpc_alloc.device_mesh.mapping
+            gradient_checkpointing = model_cfg.gradient_checkpointing and any(
+                rpc.interface_type == ModelInterfaceType.TRAIN_STEP
+                for rpc in model_rpcs
+            )
+
+            topo = get_topo(
+                rpc_alloc.parallel,
+                gradient_checkpointing=gradient_checkpointing,
+                max_prompt_len=(
+                    self.max_prompt_len
+                    if any(
+                        rpc.interface_type == ModelInterfaceType.GENERATE
+                        for rpc in model_rpcs
+                    )
+                    else None
+                ),
+            )
+
+            if any(
+                rpc.interface_type == ModelInterfaceType.TRAIN_STEP
+                for rpc in model_rpcs
+            ):
+                backend = make_train_backend_config(model_cfg, rpc_alloc.parallel)
+            else:
+                backend = make_inf_backend_config(model_cfg, rpc_alloc.parallel)
+
+            model_name_to_setup[model_name] = (mapping, topo, model, backend)
+
+        # All workers are value-identical except for their shards, so evaluate
+        # the shared property values once and reuse the references instead of
+        # rebuilding them n_nodes * n_gpus_per_node times.
+        datasets = self.datasets
+        eval_datasets = self.eval_datasets
+        eval_dataloader = self.eval_dataloader
+        tokenizer_name_or_path = self.tokenizer_name_or_path
+
         for i, j in itertools.product(range(self.n_nodes), range(self.n_gpus_per_node)):
             mw = ModelWorker(
                 seed=self.seed,
                 shards=[],
-                datasets=self.datasets,
+                datasets=datasets,
                 cuda_cache_cleanliness=False,
                 cuda_cache_clear_freq=10,
-                tokenizer_name_or_path=self.tokenizer_name_or_path,
+                tokenizer_name_or_path=tokenizer_name_or_path,
             )
             # print(f"Setting up ModelWorker ({i},{j})")
 
-            for (
-                model_name,
-                model_rpc_allocs,
-            ) in model_name_to_rpc_allocs.items():
-                rpcs = [rpc_alloc.rpc for rpc_alloc in model_rpc_allocs]
-                rpc_alloc = model_rpc_allocs[0]
-                model_cfg = self.models[model_name.role]
-                model = make_model_config(model_cfg)
-                mapping = rpc_alloc.device_mesh.mapping
-                gradient_checkpointing = model_cfg.gradient_checkpointing and any(
-                    rpc.interface_type == ModelInterfaceType.TRAIN_STEP for rpc in rpcs
-                )
-
-                topo = get_topo(
-                    rpc_alloc.parallel,
-                    gradient_checkpointing=gradient_checkpointing,
-                    max_prompt_len=(
-                        self.max_prompt_len
-                        if any(
-                            rpc.interface_type == ModelInterfaceType.GENERATE
-                            for rpc in rpcs
-                        )
-                        else None
-                    ),
-                )
-
-                if any(
-                    rpc.interface_type == ModelInterfaceType.TRAIN_STEP for rpc in rpcs
-                ):
-                    backend = make_train_backend_config(model_cfg, rpc_alloc.parallel)
-                else:
-                    backend = make_inf_backend_config(model_cfg, rpc_alloc.parallel)
-
-                # print(f"model name {model_name}, device mesh name {rpc_alloc.device_mesh.name},"
-                #       f"mapping {mapping}")
+            for model_name, (
+                mapping,
+                topo,
+                model,
+                backend,
+            ) in model_name_to_setup.items():
                 if mapping[i, j]:
                     shard_idx = shard_counter[model_name]
                     # print(f"Setting up Shard {shard_idx}, "
@@ -364,8 +388,8 @@ class CommonExperimentConfig(Experiment):
                             ),
                             model=model,
                             backend=backend,
-                            eval_datasets=self.eval_datasets,
-                            eval_dataloader=self.eval_dataloader,
+                            eval_datasets=eval_datasets,
+                            eval_dataloader=eval_dataloader,
                         )
                     )
                     shard_counter[model_name] += 1
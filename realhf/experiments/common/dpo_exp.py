@@ -1,4 +1,5 @@
 import dataclasses
+import functools
 
 import realhf.base.logging as logging
 from realhf.api.core.dfg import MFCDef, ModelInterface, ModelInterfaceType, OffloadHook
@@ -91,7 +92,7 @@ class DPOConfig(CommonExperimentConfig):
             "ref": self.ref,
         }
 
-    @property
+    @functools.cached_property
     def rpcs(self):
         interface = ModelInterface("dpo", args=dict(beta=self.beta, enable_save=True))
         ref_interface = ModelInterface(
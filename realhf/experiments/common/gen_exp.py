@@ -1,4 +1,5 @@
 import dataclasses
+import functools
 
 from omegaconf import MISSING
 
@@ -46,7 +47,7 @@ class GenerationConfig(CommonExperimentConfig):
             "default": self.model,
         }
 
-    @property
+    @functools.cached_property
     def rpcs(self):
         interface = ModelInterface("generation", args={"generation_config": self.gen})
         gen = MFCDef(
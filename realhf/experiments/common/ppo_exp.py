@@ -1,3 +1,4 @@
+import functools
 import os
 
 import torch
@@ -24,6 +25,36 @@ from realhf.experiments.common.utils import *
 
 logger = logging.getLogger("PPO exp", "colored")
 
+# Data keys of PPO model function calls.
+# Hoisted to module-level tuples such that they are allocated only once
+# instead of on every access to the `rpcs` property.
+# `MFCDef.__post_init__` coerces them back to lists.
+_ROLLOUT_INPUT = ("packed_prompts",)
+_ROLLOUT_OUTPUT = (
+    "seq_no_eos_mask",
+    "packed_seq",
+    "packed_logprobs",
+    "prompt_mask",
+    "packed_logits_mask",
+)
+_REW_INF_INPUT = ("packed_seq",)
+_REW_INF_OUTPUT = ("scores",)
+# The trailing "packed_logits_mask" is stripped when logits mask is disabled.
+_REF_INF_INPUT = ("packed_seq", "packed_logits_mask")
+_REF_INF_OUTPUT = ("logprobs",)
+_CRITIC_INF_INPUT = ("packed_seq", "seq_no_eos_mask")
+_CRITIC_INF_OUTPUT = ("scores",)
+_TRAIN_CRITIC_INPUT = (
+    "packed_seq",
+    "packed_logprobs",
+    "packed_ref_logprobs",
+    "rewards",
+    "values",
+    "prompt_mask",
+    "seq_no_eos_mask",
+)
+_TRAIN_ACTOR_INPUT = _TRAIN_CRITIC_INPUT + ("packed_logits_mask",)
+
 
 @dataclasses.dataclass
 class PPOHyperparameters:
@@ -271,7 +302,7 @@ class PPOConfig(CommonExperimentConfig):
             "reward": self.rew,
         }
 
-    @property
+    @functools.cached_property
     def rpcs(self):
         # interfaces
         actor_interface = ModelInterface(
@@ -305,14 +336,8 @@ class PPOConfig(CommonExperimentConfig):
             model_type=self.actor.type,
             model_path=self.actor.path,
             interface_impl=actor_interface,
-            input_data=["packed_prompts"],
-            output_data=[
-                "seq_no_eos_mask",
-                "packed_seq",
-                "packed_logprobs",
-                "prompt_mask",
-                "packed_logits_mask",
-            ],
+            input_data=_ROLLOUT_INPUT,
+            output_data=_ROLLOUT_OUTPUT,
             balanced_dp=True,
             min_n_seqs=self.dataset.train_bs_n_seqs,
             max_n_seqs=self.dataset.train_bs_n_seqs,
@@ -324,19 +349,17 @@ class PPOConfig(CommonExperimentConfig):
             interface_impl=rw_interface,
             model_type=self.rew.type,
             model_path=self.rew.path,
-            input_data=["packed_seq"],
+            input_data=_REW_INF_INPUT,
             input_key_remap={"packed_seq": "packed_input_ids"},
-            output_data=["scores"],
+            output_data=_REW_INF_OUTPUT,
             output_key_remap={"scores": "rewards"},
             min_n_seqs=self.dataset.train_bs_n_seqs,
             max_n_seqs=self.dataset.train_bs_n_seqs,
         )
 
-        inf_ref_inputs = ["packed_seq"]
-        if not self.ppo.force_no_logits_mask:
-            inf_ref_inputs.append(
-                "packed_logits_mask",
-            )
+        inf_ref_inputs = (
+            _REF_INF_INPUT[:-1] if self.ppo.force_no_logits_mask else _REF_INF_INPUT
+        )
         inf_ref_logits = MFCDef(
             model_name=ModelName("ref", 0),
             interface_type=ModelInterfaceType.INFERENCE,
@@ -344,7 +367,7 @@ class PPOConfig(CommonExperimentConfig):
             model_path=self.ref.path,
             interface_impl=ref_interface,
             input_data=inf_ref_inputs,
-            output_data=["logprobs"],
+            output_data=_REF_INF_OUTPUT,
             output_key_remap={"logprobs": "packed_ref_logprobs"},
             min_n_seqs=self.dataset.train_bs_n_seqs,
             max_n_seqs=self.dataset.train_bs_n_seqs,
@@ -356,25 +379,18 @@ class PPOConfig(CommonExperimentConfig):
             interface_impl=critic_interface,
             model_type=self.critic.type,
             model_path=self.critic.path,
-            input_data=["packed_seq", "seq_no_eos_mask"],
-            output_data=["scores"],
+            input_data=_CRITIC_INF_INPUT,
+            output_data=_CRITIC_INF_OUTPUT,
             output_key_remap={"scores": "values"},
             min_n_seqs=self.dataset.train_bs_n_seqs,
             max_n_seqs=self.dataset.train_bs_n_seqs,
         )
 
-        train_actor_inputs = [
-            "packed_seq",
-            "packed_logprobs",
-            "packed_ref_logprobs",
-            "rewards",
-            "values",
-            "prompt_mask",
-            "seq_no_eos_mask",
-            "packed_logits_mask",
-        ]
-        if self.ppo.force_no_logits_mask:
-            train_actor_inputs.remove("packed_logits_mask")
+        train_actor_inputs = (
+            _TRAIN_ACTOR_INPUT[:-1]
+            if self.ppo.force_no_logits_mask
+            else _TRAIN_ACTOR_INPUT
+        )
         train_actor = MFCDef(
             model_name=ModelName("actor", 0),
             interface_type=ModelInterfaceType.TRAIN_STEP,
@@ -395,15 +411,7 @@ class PPOConfig(CommonExperimentConfig):
             interface_impl=critic_interface,
             model_type=self.critic.type,
             model_path=self.critic.path,
-            input_data=[
-                "packed_seq",
-                "packed_logprobs",
-                "packed_ref_logprobs",
-                "rewards",
-                "values",
-                "prompt_mask",
-                "seq_no_eos_mask",
-            ],
+            input_data=_TRAIN_CRITIC_INPUT,
             log_return_value=True,
             # pre_hooks=[SyncParamHook(source=ModelName("critic", 0))],
             # post_hooks=[SyncParamHook(target=ModelName("critic", 0))],
@@ -475,6 +483,9 @@ class PPOConfig(CommonExperimentConfig):
 
         assert self.n_gpus_per_node == 8
 
+        # Shared zero-byte all-ones view for RPCs placed on the full mesh.
+        full_mapping = np.broadcast_to(np.int32(1), (self.n_nodes, 8))
+
         actor_size = self.actor.type.size
         critic_size = self.critic.type.size
 
@@ -486,7 +497,7 @@ class PPOConfig(CommonExperimentConfig):
             device_mesh=DeviceMesh(
                 n_nodes=self.n_nodes,
                 n_gpus_per_node=8,
-                mapping=np.ones((self.n_nodes, 8), dtype=np.int32),
+                mapping=full_mapping,
                 global_mesh_name=self.nodelist,
             ),
             parallel=ParallelismConfig(
@@ -577,7 +588,7 @@ class PPOConfig(CommonExperimentConfig):
             device_mesh=DeviceMesh(
                 n_nodes=self.n_nodes,
                 n_gpus_per_node=8,
-                mapping=np.ones((self.n_nodes, 8), dtype=np.int32),
+                mapping=full_mapping,
                 global_mesh_name=self.nodelist,
             ),
             parallel=ParallelismConfig(
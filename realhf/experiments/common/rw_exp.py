@@ -1,4 +1,5 @@
 import dataclasses
+import functools
 from typing import List
 
 from realhf.api.core.dfg import MFCDef, ModelInterface, ModelInterfaceType
@@ -75,7 +76,7 @@ class RWConfig(CommonExperimentConfig):
             "default": self.model,
         }
 
-    @property
+    @functools.cached_property
     def rpcs(self):
         interface = ModelInterface("paired_rw")
         rpc = MFCDef(
@@ -1,4 +1,5 @@
 import dataclasses
+import functools
 
 from omegaconf import MISSING
 
@@ -59,7 +60,7 @@ class SFTConfig(CommonExperimentConfig):
             "default": self.model,
         }
 
-    @property
+    @functools.cached_property
     def rpcs(self):
         interface = ModelInterface("sft")
         rpc = MFCDef(
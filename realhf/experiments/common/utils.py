@@ -10,8 +10,11 @@ from realhf.api.quickstart.model import (
     ParallelismConfig,
     get_real_model_config,
 )
+from realhf.base import logging
 from realhf.base.topology import PipeModelDataParallelTopology
 
+logger = logging.getLogger("Experiment Utils")
+
 
 def get_topo(
     parallel: ParallelismConfig,
@@ -153,4 +156,4 @@ def resolve_rpc_hooks(rpc_allocs: List[RPCAllocation]):
             if offload_flag:
                 rpc.post_hooks.append(OffloadHook())
 
-        print("resolve rpc hooks", rpc.name, rpc.model_name)
+        logger.debug(f"Resolved hooks of RPC {rpc.name} ({rpc.model_name}).")
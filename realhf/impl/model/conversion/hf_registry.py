@@ -1,3 +1,4 @@
+import concurrent.futures
 import dataclasses
 import json
 import os
@@ -10,7 +11,11 @@ import transformers
 
 from realhf.api.core import model_api
 from realhf.base import constants, logging
-from realhf.base.saveload_utils import load_safetensor, split_state_dict_into_shards
+from realhf.base.saveload_utils import (
+    load_safetensor,
+    save_safetensor,
+    split_state_dict_into_shards,
+)
 from realhf.impl.model.nn.real_llm_api import ReaLModel
 from realhf.impl.model.nn.real_llm_parallel import (
     mp_merge_key,
@@ -125,7 +130,11 @@ class HFModelRegistry:
         for fn in files_to_load:
             load_tik = time.perf_counter()
             if fn.endswith(".safetensors"):
-                sd = load_safetensor(os.path.join(load_dir, fn))
+                # Fetch only this stage's parameters; the rest of the
+                # file is never read from disk.
+                sd = load_safetensor(
+                    os.path.join(load_dir, fn), keys=required_hf_sd_names
+                )
             else:
                 # set map_location to be CPU is a little bit faster
                 sd = torch.load(os.path.join(load_dir, fn), map_location="cpu")
@@ -139,6 +148,10 @@ class HFModelRegistry:
                 constants.model_parallel_rank(),
             )
             state_dict.update(psd)
+            # The kept shards own their storage, so dropping the
+            # unpartitioned tensors here frees them before the next file
+            # is read instead of at the end of the loop.
+            del sd, psd
             load_times.append(partition_tik - load_tik)
             partition_times.append(time.perf_counter() - partition_tik)
 
@@ -282,68 +295,122 @@ class HFModelRegistry:
         )
         param_size = param_size.item()
 
-        # Save tokenizer and huggingface model config.
-        if pp_rank == 0 and dp_rank == 0 and mp_rank == 0:
-            hf_config.save_pretrained(save_dir)
-            if tokenizer is not None:
-                tokenizer.save_pretrained(save_dir)
-
-        # Dump parameters to disk.
-        if len(pp_stage_n_shards) == 1 and pp_stage_n_shards[0] == 1:
-            fn = "pytorch_model.bin"
-            if pp_rank == 0 and dp_rank == 0 and mp_rank == 0:
-                torch.save(hf_sd, os.path.join(save_dir, fn))
-        else:
-            output_fn = (
-                "pytorch_model"
-                + "-{shard:05d}"
-                + f"-of-{sum(pp_stage_n_shards):05d}.bin"
-            )
-
-            n_shards = pp_stage_n_shards[pp_rank]
-            shard_offset = sum(pp_stage_n_shards[:pp_rank])
-
-            shards = split_state_dict_into_shards(hf_sd, n_shards)
-
-            bin_index = {}
-            bin_index["metadata"] = dict(total_size=param_size)
-            bin_index["weight_map"] = {}
-            weight_map = {}
-
-            mesh_size = dp_size * mp_size
-            mesh_idx = dp_rank * mp_size + mp_rank
-            n_shards_per_gpu = (n_shards + mesh_size - 1) // mesh_size
-            if mesh_idx < len(range(0, n_shards, n_shards_per_gpu)):
-                s = list(range(0, n_shards, n_shards_per_gpu))[mesh_idx]
+        # Dump parameters to disk. Shards are written with safetensors
+        # directly: tensor buffers go to disk without the pickle
+        # serialization pass of torch.save, and the format is what the
+        # load path prefers anyway. Writes are issued asynchronously so
+        # the index gather and config/tokenizer dump below run while
+        # shards flush; on network filesystems the per-file fsync
+        # latency otherwise serializes with this metadata work.
+        save_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        save_futures: List[concurrent.futures.Future] = []
+        prev_num_threads: Optional[int] = None
+        try:
+            if len(pp_stage_n_shards) == 1 and pp_stage_n_shards[0] == 1:
+                fn = "model.safetensors"
+                if pp_rank == 0 and dp_rank == 0 and mp_rank == 0:
+                    save_safetensor(hf_sd, os.path.join(save_dir, fn))
             else:
-                s = n_shards
-
-            for i, shard in enumerate(shards[s : s + n_shards_per_gpu]):
-                shard_idx = shard_offset + i + s
-                torch.save(
-                    shard,
-                    os.path.join(save_dir, output_fn.format(shard=shard_idx + 1)),
+                output_fn = (
+                    "model"
+                    + "-{shard:05d}"
+                    + f"-of-{sum(pp_stage_n_shards):05d}.safetensors"
                 )
 
-            for i, shard in enumerate(shards):
-                shard_idx = shard_offset + i
-                for k in shard:
-                    weight_map[k] = output_fn.format(shard=shard_idx + 1)
+                n_shards = pp_stage_n_shards[pp_rank]
+                shard_offset = sum(pp_stage_n_shards[:pp_rank])
+
+                shards = split_state_dict_into_shards(hf_sd, n_shards)
+
+                bin_index = {}
+                bin_index["metadata"] = dict(total_size=param_size)
+                bin_index["weight_map"] = {}
+                weight_map = {}
+
+                mesh_size = dp_size * mp_size
+                mesh_idx = dp_rank * mp_size + mp_rank
+                n_shards_per_gpu = (n_shards + mesh_size - 1) // mesh_size
+                if mesh_idx < len(range(0, n_shards, n_shards_per_gpu)):
+                    s = list(range(0, n_shards, n_shards_per_gpu))[mesh_idx]
+                else:
+                    s = n_shards
+
+                shards_to_save = [
+                    (
+                        shard,
+                        os.path.join(
+                            save_dir,
+                            output_fn.format(shard=shard_offset + i + s + 1),
+                        ),
+                    )
+                    for i, shard in enumerate(shards[s : s + n_shards_per_gpu])
+                ]
+                # Shard dumps are I/O-bound and release the GIL while
+                # writing, so saving them from a thread pool overlaps
+                # serialization with disk bandwidth when one process owns
+                # several shards.
+                if shards_to_save:
+                    # Writer threads only serialize and copy bytes; clamp
+                    # torch's intra-op pool to one thread while they run
+                    # so a stray .contiguous() inside a worker does not
+                    # spin up a full OMP team per writer (workers x OMP
+                    # threads).
+                    prev_num_threads = torch.get_num_threads()
+                    torch.set_num_threads(1)
+                    save_pool = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=min(len(shards_to_save), os.cpu_count() or 1, 16)
+                    )
+                    save_futures = [
+                        save_pool.submit(save_safetensor, shard, path)
+                        for shard, path in shards_to_save
+                    ]
+
+                for i, shard in enumerate(shards):
+                    shard_fn = output_fn.format(shard=shard_offset + i + 1)
+                    for k in shard:
+                        weight_map[k] = shard_fn
+
+                weight_map_list = [None for _ in range(pp_size)]
+                dist.all_gather_object(
+                    weight_map_list,
+                    weight_map,
+                    group=constants.pipe_parallel_group(),
+                )
+                for wm in weight_map_list:
+                    bin_index["weight_map"].update(wm)
 
-            weight_map_list = [None for _ in range(pp_size)]
-            dist.all_gather_object(
-                weight_map_list,
-                weight_map,
-                group=constants.pipe_parallel_group(),
-            )
-            for wm in weight_map_list:
-                bin_index["weight_map"].update(wm)
+                if pp_rank == 0 and dp_rank == 0 and mp_rank == 0:
+                    with open(
+                        os.path.join(save_dir, "model.safetensors.index.json"), "w"
+                    ) as f:
+                        json.dump(bin_index, f, indent=4)
 
+            # Save tokenizer and huggingface model config while shards flush.
             if pp_rank == 0 and dp_rank == 0 and mp_rank == 0:
-                with open(
-                    os.path.join(save_dir, "pytorch_model.bin.index.json"), "w"
-                ) as f:
-                    json.dump(bin_index, f, indent=4)
+                hf_config.save_pretrained(save_dir)
+                if tokenizer is not None:
+                    tokenizer.save_pretrained(save_dir)
+
+        finally:
+            # Always join the writer threads, even when the weight-map
+            # collective or a metadata dump raises; otherwise the pool
+            # leaks threads holding references to the shard state dicts.
+            # Draining the futures also blocks until every shard of this
+            # process is durable: the checkpoint must be complete when
+            # save() returns, and on the success path this surfaces any
+            # shard-write failure.
+            try:
+                if save_pool is not None:
+                    save_pool.shutdown(wait=True)
+                    for fut in save_futures:
+                        fut.result()
+            finally:
+                # Restore the intra-op pool even when a shard write, the
+                # weight-map collective, or a metadata dump raises;
+                # otherwise the whole training process stays clamped to
+                # one thread.
+                if prev_num_threads is not None:
+                    torch.set_num_threads(prev_num_threads)
         t3 = time.perf_counter()
 
         metadata_t = t1 - tik
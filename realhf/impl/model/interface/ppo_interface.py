@@ -20,6 +20,7 @@ from realhf.impl.model.utils.functional import (
     apply_logits_mask,
     gather_packed_shifted_log_probs,
     masked_normalization,
+    pack_logits_mask,
 )
 from realhf.impl.model.utils.padding import unpad_input
 
@@ -229,7 +230,7 @@ class PPOActorInterface(model_api.ModelInterface):
             packed_seq=packed_seq,
             packed_logprobs=packed_logprobs,
             packed_logits_mask=(
-                packed_logits_mask.bool()
+                pack_logits_mask(packed_logits_mask.bool())
                 if not self.force_no_logits_mask and packed_logits_mask is not None
                 else None
             ),
@@ -395,9 +396,17 @@ class PPOActorInterface(model_api.ModelInterface):
         )
 
         if data_["packed_logits_mask"] is not None:
-            n_masked_vocabs = data_["packed_logits_mask"].count_nonzero()
+            # The mask is bit-packed (uint8); count set bits through a
+            # byte-popcount table. Vocab padding bits are always zero.
+            packed_mask = data_["packed_logits_mask"]
+            popcount = torch.tensor(
+                [bin(i).count("1") for i in range(256)],
+                dtype=torch.long,
+                device=packed_mask.device,
+            )
+            n_masked_vocabs = popcount[packed_mask.long()].sum()
             total_vocabs = torch.tensor(
-                data_["packed_logits_mask"].numel(),
+                packed_mask.numel() * 8,
                 dtype=torch.long,
                 device=model.device,
             )
@@ -9,10 +9,12 @@ from realhf.api.core import model_api
 from realhf.api.core.config import ModelName
 from realhf.base import logging
 
+logger = logging.getLogger("FlattenParam")
+
 try:
     import realhf._C.interval_op_cuda as interval_op_cuda
 except ImportError:
-    print(
+    logger.info(
         "interval_op_cuda not found. "
         "This should only appear on workers without CUDA supports."
     )
@@ -29,8 +31,6 @@ from .real_llm_parallel import (
     shape_partition_fn,
 )
 
-logger = logging.getLogger("FlattenParam")
-
 MAX_PYTORCH_N_INTERVALS = 1024
 CUDA_INTERVAL_OP_CHUNK_SIZE = 2048
 _FLAT_PARAM_INDICES_CACHE = {}
@@ -528,17 +528,17 @@ class ReaLModel(nn.Module):
         new_state_dict = {}
         for k, v in state_dict.items():
             k = k.lstrip("module.").lstrip("layers.")
-            local_idx = int(k.split(".")[0])
-            name = k.split(".", 1)[1]
-            new_state_dict[f"{local_idx + self.layer_idx_start}.{name}"] = v
+            # One split yields both the layer index and the rest of the
+            # name; this runs once per parameter on every save.
+            local_idx, name = k.split(".", 1)
+            new_state_dict[f"{int(local_idx) + self.layer_idx_start}.{name}"] = v
         return new_state_dict
 
     def load_state_dict(self, state_dict, strict: bool = True, assign: bool = False):
         new_state_dict = {}
         for k, v in state_dict.items():
-            name = k.split(".", 1)[1]
-            global_idx = int(k.split(".")[0])
-            new_state_dict[f"layers.{global_idx - self.layer_idx_start}.{name}"] = v
+            global_idx, name = k.split(".", 1)
+            new_state_dict[f"layers.{int(global_idx) - self.layer_idx_start}.{name}"] = v
         return super().load_state_dict(
             new_state_dict,
             strict=strict,
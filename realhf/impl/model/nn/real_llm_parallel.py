@@ -1,3 +1,5 @@
+import functools
+import os
 from typing import *
 
 import numpy as np
@@ -36,6 +38,13 @@ if constants.use_te_impl():
     ROW_LINEAR_KEYS = [".attn.c_proj", ".mlp.fc2_weight"]
 
 
+@functools.lru_cache(maxsize=None)
+def _output_head_key(n_layers: int) -> str:
+    # The key helpers below compare every state-dict key against this;
+    # caching it avoids rebuilding the same f-string per key per pass.
+    return f"{n_layers + 1}.weight"
+
+
 def tensor_slice_partition_fn(
     tensor: torch.Tensor,
     mp_rank: Optional[int],
@@ -44,14 +53,21 @@ def tensor_slice_partition_fn(
 ) -> Union[List[torch.Tensor], torch.Tensor]:
     """Partition a pytorch tensor for model parallelism."""
     if dim is None:
-        splits = [tensor for _ in range(mp_world_size)]
-    else:
-        assert tensor.shape[dim] % mp_world_size == 0
-        splits = torch.split(tensor, tensor.shape[dim] // mp_world_size, dim=dim)
+        # Replicated parameter; no slicing, hence nothing to detach from.
+        if mp_rank is None:
+            return [tensor for _ in range(mp_world_size)]
+        return tensor
+
+    assert tensor.shape[dim] % mp_world_size == 0
+    splits = torch.split(tensor, tensor.shape[dim] // mp_world_size, dim=dim)
+    # torch.split returns views, and .contiguous() is a no-op on dim-0
+    # slices, so the shard would keep the whole source tensor's storage
+    # alive. Clone such views so each shard owns its rows and the source
+    # can be freed as soon as the caller drops it.
     if mp_rank is None:
-        return [s.contiguous() for s in splits]
-    else:
-        return splits[mp_rank].contiguous()
+        return [s.clone() if s.is_contiguous() else s.contiguous() for s in splits]
+    s = splits[mp_rank]
+    return s.clone() if s.is_contiguous() else s.contiguous()
 
 
 def intervals_partition_fn(
@@ -136,7 +152,7 @@ def mp_partition_key(
     if any([ek in key for ek in EMBEDDING_KEYS]):
         assert "weight" in key
         return partition_fn(tensor_or_shape, mp_rank, mp_size, dim=0)
-    elif key == f"{config.n_layers + 1}.weight":  # output head
+    elif key == _output_head_key(config.n_layers):  # output head
         if (
             isinstance(tensor_or_shape, torch.Tensor) and tensor_or_shape.shape[0] == 1
         ) or (
@@ -172,24 +188,23 @@ def mp_partition_real_model_state_dict(
     config: model_api.ReaLModelConfig,
     mp_size: int,
     mp_rank: Optional[int] = None,
-) -> Union[Dict, List[Dict]]:
-    if mp_size == 1:
-        if mp_rank is None:
-            return [state_dict]
-        else:
+) -> Union[Dict, Iterator[Dict]]:
+    if mp_rank is not None:
+        if mp_size == 1:
             return state_dict
-
-    new_state_dict = {}
-    for k, v in state_dict.items():
-        new_state_dict[k] = mp_partition_key(k, v, mp_rank, mp_size, config)
-
-    if mp_rank is None:
-        return [
-            {k: v[mp_rank] for k, v in new_state_dict.items()}
-            for mp_rank in range(mp_size)
-        ]
-    else:
-        return new_state_dict
+        return {
+            k: mp_partition_key(k, v, mp_rank, mp_size, config)
+            for k, v in state_dict.items()
+        }
+
+    # With mp_rank=None, yield one rank's shard at a time instead of
+    # materializing every rank's contiguous copy up front. Peak host
+    # memory stays at the source dict plus a single shard; consumers
+    # iterate and drop each shard before the next is built.
+    return (
+        mp_partition_real_model_state_dict(state_dict, config, mp_size, rank)
+        for rank in range(mp_size)
+    )
 
 
 def get_real_model_param_shape(
@@ -216,7 +231,7 @@ def get_real_model_param_shape(
         )
     elif ".ln." in k or ".ln_f." in k:
         return (config.hidden_dim,)
-    elif k == f"{config.n_layers + 1}.weight":  # output head
+    elif k == _output_head_key(config.n_layers):  # output head
         if config.is_critic and sequence_parallel:
             return (1, config.hidden_dim)
         elif not config.is_critic and mp_size > 1:
@@ -278,7 +293,7 @@ def mp_merge_key(
 ) -> torch.Tensor:
     if any([ek in k for ek in EMBEDDING_KEYS]) and "weight" in k:
         return torch.cat(tensors, dim=0)
-    elif k == f"{config.n_layers + 1}.weight" and not config.is_critic:
+    elif k == _output_head_key(config.n_layers) and not config.is_critic:
         return torch.cat(tensors, dim=0)
     elif any([ck in k for ck in COLUMN_LINEAR_KEYS]):
         return torch.cat(tensors, dim=0)
@@ -311,12 +326,23 @@ def partition_pipeline_layers(
     head_param_counter: Callable[[model_api.ReaLModelConfig], int],
     method: str = "parameters_balanced",
 ) -> Dict[int, Tuple[int, int]]:
-    # TODO: partition according to occupied GPU memory, e.g., logits occupy larger memory
-    from deepspeed.runtime import utils as ds_utils
+    """Partition embeddings, transformer blocks, and the head into pipeline stages.
 
+    Layer weights come from the analytical counters derived from the model
+    config, so no layer is ever instantiated for partitioning regardless of
+    `method`. "uniform" balances layer counts, "parameters" uses deepspeed's
+    greedy balancing, "parameters_balanced" (default) uses the exact DP
+    partitioner from datapack, and "memory_aware" additionally biases
+    layers away from early stages, which hold activations of more
+    in-flight micro-batches under the 1F1B schedule.
+
+    Returns a dict mapping stage index to its [start, stop) layer range.
+    """
+    # TODO: partition according to occupied GPU memory, e.g., logits occupy larger memory
     from realhf.base.datapack import partition_balanced as true_partition_balanced
 
-    # Each stage gets a simple uniform number of layers.
+    # Parameter counts come from the closed-form counters; no layer is
+    # ever instantiated for partitioning.
     param_counts = (
         [embed_param_counter(config)]
         + [transformer_block_param_counter(config, i) for i in range(config.n_layers)]
@@ -324,23 +350,32 @@ def partition_pipeline_layers(
     )
     parts = None
     if method == "uniform":
+        from deepspeed.runtime import utils as ds_utils
+
         parts = ds_utils.partition_uniform(
             num_items=config.n_layers + 2, num_parts=num_stages
         )
     elif method == "parameters":
+        from deepspeed.runtime import utils as ds_utils
+
         parts = ds_utils.partition_balanced(weights=param_counts, num_parts=num_stages)
     elif method == "parameters_balanced":
         param_counts = np.array(param_counts)
         parts = true_partition_balanced(nums=param_counts, k=num_stages)
+    elif method == "memory_aware":
+        # Stage i keeps activations of (num_stages - i) in-flight
+        # micro-batches, so equal parameter counts leave stage 0 with
+        # the largest memory footprint. Inflate early layers' weights so
+        # the balanced partition shifts a few layers toward later stages.
+        alpha = float(os.getenv("REAL_PP_MEMORY_BIAS", "0.1"))
+        n_items = config.n_layers + 2
+        scale = 1.0 + alpha * (1.0 - np.arange(n_items) / max(n_items - 1, 1))
+        weighted = (np.array(param_counts, dtype=np.float64) * scale).astype(np.int64)
+        parts = true_partition_balanced(nums=weighted, k=num_stages)
     else:
         raise NotImplementedError(f"Partitioning method {method} not implemented.")
 
-    stage_to_layer_idx = {}
-    for stage in range(num_stages):
-        start = parts[stage]
-        stop = parts[stage + 1]
-        stage_to_layer_idx[stage] = (start, stop)
-    return stage_to_layer_idx
+    return {stage: (parts[stage], parts[stage + 1]) for stage in range(num_stages)}
 
 
 def pipeline_repartition_strategy(
@@ -228,15 +228,64 @@ def gather_packed_shifted_log_probs(
     return log_probs_labels
 
 
-def apply_logits_mask(logits: torch.HalfTensor, mask: torch.BoolTensor):
-    assert mask.shape[-1] == logits.shape[-1] * constants.model_parallel_world_size(), (
-        constants.model_parallel_world_size(),
-        logits.shape,
-        mask.shape,
+def pack_logits_mask(mask: torch.BoolTensor) -> torch.Tensor:
+    """Bit-pack a bool logits mask along the vocab axis.
+
+    The logits mask dominates generation outputs (seqlen x vocab bools);
+    packing eight vocab entries per byte shrinks the cross-worker
+    transfer and the CPU-side data cache by 8x. The vocab axis is
+    zero-padded to a multiple of 8. ``apply_logits_mask`` accepts either
+    layout, so consumers need no changes.
+    """
+    pad = -mask.shape[-1] % 8
+    if pad:
+        mask = torch.nn.functional.pad(mask, (0, pad))
+    bits = mask.view(*mask.shape[:-1], -1, 8).to(torch.uint8)
+    weights = torch.tensor(
+        [1, 2, 4, 8, 16, 32, 64, 128], dtype=torch.uint8, device=mask.device
     )
+    return (bits * weights).sum(-1).to(torch.uint8)
+
+
+def unpack_logits_mask(packed: torch.Tensor, vocab_size: int) -> torch.BoolTensor:
+    """Invert :func:`pack_logits_mask`, truncating the vocab padding."""
+    shifts = torch.arange(8, dtype=torch.uint8, device=packed.device)
+    bits = packed.unsqueeze(-1).bitwise_right_shift(shifts).bitwise_and(1)
+    return bits.flatten(-2).bool()[..., :vocab_size]
+
+
+def apply_logits_mask(logits: torch.HalfTensor, mask: torch.Tensor):
     parallel_vocab_size = logits.shape[-1]
     mp_rank = constants.model_parallel_rank()
-    mask = mask[:, mp_rank * parallel_vocab_size : (mp_rank + 1) * parallel_vocab_size]
+    if mask.dtype == torch.uint8:
+        # Bit-packed layout (see pack_logits_mask). Slice the local
+        # model-parallel vocab range in the packed domain, then unpack
+        # only this slice.
+        assert parallel_vocab_size % 8 == 0, (logits.shape, mask.shape)
+        assert (
+            mask.shape[-1] * 8
+            >= parallel_vocab_size * constants.model_parallel_world_size()
+        ), (
+            constants.model_parallel_world_size(),
+            logits.shape,
+            mask.shape,
+        )
+        start = mp_rank * parallel_vocab_size // 8
+        mask = unpack_logits_mask(
+            mask[:, start : start + parallel_vocab_size // 8], parallel_vocab_size
+        )
+    else:
+        assert (
+            mask.shape[-1]
+            == parallel_vocab_size * constants.model_parallel_world_size()
+        ), (
+            constants.model_parallel_world_size(),
+            logits.shape,
+            mask.shape,
+        )
+        mask = mask[
+            :, mp_rank * parallel_vocab_size : (mp_rank + 1) * parallel_vocab_size
+        ]
     logits.masked_fill_(mask, torch.finfo(logits.dtype).min)
 
 
@@ -12,6 +12,53 @@ from realhf.search_engine.estimate import (
 MEM_INDEX = 1.0  # heuristic value to scale estimated memory
 
 
+def _valid_parallel_for_rpc(
+    rpc: MFCDef,
+    parallel,
+    device_mesh: DeviceMesh,
+    n_ppo_minibatches: int,
+) -> bool:
+    """Cheap validity and heuristic checks for one parallel strategy.
+
+    Split by interface type: training has stricter batch size and
+    intra-node constraints than generate/inference. Evaluated before the
+    (comparatively expensive) memory/time cost models.
+    """
+    num_dp = parallel.data_parallel_size
+    num_pp = parallel.pipeline_parallel_size
+    num_mp = parallel.model_parallel_size
+    if num_mp > 8:
+        return False
+    if num_pp > max(device_mesh.n_nodes, 8):
+        return False
+    if rpc.interface_type == ModelInterfaceType.TRAIN_STEP:
+        # batch size too small for 2 micro-batches per PPO minibatch
+        if 2 * num_dp * num_pp * n_ppo_minibatches > rpc.min_n_seqs:
+            return False
+        # heuristic to filter out inherent slow configurations
+        if num_mp * num_dp > device_mesh.n_gpus_per_node:
+            return False
+    else:
+        # batch size too small
+        if num_dp * num_pp > rpc.min_n_seqs:
+            return False
+    return True
+
+
+def enumerate_candidate_placements(device_mesh: DeviceMesh):
+    """Enumerate all (sub device mesh, parallel strategy) pairs once.
+
+    The candidate set only depends on the device mesh, so callers that
+    enumerate executions for multiple RPCs should compute it a single
+    time and pass it to :func:`enumerate_rpc_executions`.
+    """
+    return [
+        (sub_device_mesh, parallel)
+        for sub_device_mesh in device_mesh.sub_device_meshes()
+        for parallel in find_parallel_strategies(sub_device_mesh)
+    ]
+
+
 def enumerate_rpc_executions(
     rpc: MFCDef,
     device_mesh: DeviceMesh,
@@ -19,71 +66,52 @@ def enumerate_rpc_executions(
     num_gen_tokens: int,
     n_ppo_minibatches: int,
     gradient_checkpointing: bool,
+    candidates=None,
 ) -> List[RPCExecution]:
-    sub_device_meshes = device_mesh.sub_device_meshes()
-    import pprint
+    if candidates is None:
+        candidates = enumerate_candidate_placements(device_mesh)
 
     feasible = []
-    for sub_device_mesh in sub_device_meshes:
-        ps = find_parallel_strategies(sub_device_mesh)
-        for parallel in ps:
-            num_dp = parallel.data_parallel_size
-            num_pp = parallel.pipeline_parallel_size
-            num_mp = parallel.model_parallel_size
-            bs = rpc.min_n_seqs
-            # seq_len = seq_len
-            min_bs = (
-                2 * num_dp * num_pp * n_ppo_minibatches
-                if rpc.interface_type == ModelInterfaceType.TRAIN_STEP
-                else num_dp * num_pp
-            )
-            if min_bs > bs:
-                # batch size too small
-                continue
-            # heuristic to filter out inherent slow configurations
-            if (
-                num_mp * num_dp > device_mesh.n_gpus_per_node
-                and rpc.interface_type == ModelInterfaceType.TRAIN_STEP
-            ):
-                continue
-            if num_mp > 8:
-                continue
-            if num_pp > max(device_mesh.n_nodes, 8):
-                continue
-            # memory and time estimation
-            mem_cost, static_mem = estimate_rpc_memory_cost(
-                rpc,
-                parallel,
-                bs,
-                seq_len,
-                gradient_checkpointing=gradient_checkpointing,
-                n_ppo_minibatches=n_ppo_minibatches,
-                num_gen_tokens=num_gen_tokens,
-                offload=rpc.model_name.role in ["ref", "reward"],
-            )
-            mem_cost = int(mem_cost * MEM_INDEX)
-            static_mem = int(static_mem * MEM_INDEX)
-            time_cost = estimate_rpc_time_cost(
-                rpc,
-                parallel,
-                bs=bs,
-                seq_len=seq_len,
-                num_gen_tokens=num_gen_tokens,
-                gradient_checkpointing=gradient_checkpointing,
-                n_ppo_minibatches=n_ppo_minibatches,
-            )
-            time_cost = int(time_cost)
-            if mem_cost < device_mesh.gpu_memory_capacity:
-                feasible.append(
-                    RPCExecution(
-                        rpc,
-                        sub_device_mesh,
-                        parallel,
-                        time_cost,
-                        mem_cost,
-                        static_mem,
-                    )
+    for sub_device_mesh, parallel in candidates:
+        if not _valid_parallel_for_rpc(
+            rpc, parallel, device_mesh, n_ppo_minibatches
+        ):
+            continue
+        bs = rpc.min_n_seqs
+        # memory and time estimation
+        mem_cost, static_mem = estimate_rpc_memory_cost(
+            rpc,
+            parallel,
+            bs,
+            seq_len,
+            gradient_checkpointing=gradient_checkpointing,
+            n_ppo_minibatches=n_ppo_minibatches,
+            num_gen_tokens=num_gen_tokens,
+            offload=rpc.model_name.role in ["ref", "reward"],
+        )
+        mem_cost = int(mem_cost * MEM_INDEX)
+        static_mem = int(static_mem * MEM_INDEX)
+        time_cost = estimate_rpc_time_cost(
+            rpc,
+            parallel,
+            bs=bs,
+            seq_len=seq_len,
+            num_gen_tokens=num_gen_tokens,
+            gradient_checkpointing=gradient_checkpointing,
+            n_ppo_minibatches=n_ppo_minibatches,
+        )
+        time_cost = int(time_cost)
+        if mem_cost < device_mesh.gpu_memory_capacity:
+            feasible.append(
+                RPCExecution(
+                    rpc,
+                    sub_device_mesh,
+                    parallel,
+                    time_cost,
+                    mem_cost,
+                    static_mem,
                 )
+            )
     return feasible
 
 
@@ -69,7 +69,14 @@ def search_rpc_allocations(
 
     n_nodes = device_mesh.n_nodes
     table = {}
+    # Several RPCs share the same model (e.g., actor generate/train);
+    # query the realloc stats once per distinct (model_type, model_path).
+    visited_models = set()
     for rpc in rpcs:
+        model_key = (str(rpc.model_type), rpc.model_path)
+        if model_key in visited_models:
+            continue
+        visited_models.add(model_key)
         print(f"Getting param realloc stats for {rpc.model_type} at {rpc.model_path}")
         t = get_param_realloc_stats(rpc.model_type, rpc.model_path, n_nodes, True)
         table.update(t)
@@ -164,7 +171,14 @@ def make_rpc_exe_list(
     if_print: bool = False,
     log_dir: Optional[str] = None,
 ) -> List[RPCExecution]:
-    from realhf.search_engine.enumerate import enumerate_rpc_executions
+    from realhf.search_engine.enumerate import (
+        enumerate_candidate_placements,
+        enumerate_rpc_executions,
+    )
+
+    # Candidate placements depend only on the device mesh;
+    # enumerate them once instead of once per RPC.
+    candidates = enumerate_candidate_placements(device_mesh)
 
     rpc_exe_list = []
     log_flag = False
@@ -177,6 +191,7 @@ def make_rpc_exe_list(
             num_gen_tokens=num_gen_tokens,
             n_ppo_minibatches=n_ppo_minibatches,
             gradient_checkpointing=gradient_checkpointing,
+            candidates=candidates,
         )
         rpc_exe_list.extend(feasible)
 
@@ -1,3 +1,5 @@
+import functools
+
 import realhf.base.constants as constants
 import realhf.base.namedarray
 from realhf.api.core.model_api import ReaLModelConfig
@@ -24,12 +26,12 @@ def random_sample(bs, seq_len, vocab_size):
     return data
 
 
+@functools.lru_cache(maxsize=None)
 def find_factors(n):
-    factors = []
-    for i in range(1, n + 1):
-        if n % i == 0:
-            factors.append(i)
-    return factors
+    # Cached: the search engine queries the same small set of values
+    # (GPU counts and their quotients) over and over again.
+    # Return a tuple so that cached results stay immutable.
+    return tuple(i for i in range(1, n + 1) if n % i == 0)
 
 
 def make_stats_key(rpc_name, bs, seq_len):
@@ -1,5 +1,4 @@
 import asyncio
-import copy
 import time
 from dataclasses import dataclass, field
 from typing import *
@@ -12,30 +11,17 @@ import realhf.base.logging as logging
 logger = logging.getLogger("buffer")
 
 
-def _extract_intervals(arr):
-    if len(arr) == 0:
-        return []
+def _last_contiguous_interval(arr: np.ndarray) -> Tuple[int, int]:
+    """Return the [start, end) bounds of the last contiguous run in a
+    sorted index array, e.g., [0, 1, 5, 6, 7] -> (5, 8).
 
-    # Initialize the list to hold the intervals
-    intervals = []
-
-    # Start of the first interval
-    start = arr[0]
-
-    for i in range(1, len(arr)):
-        # Check if the current element is not contiguous with the previous one
-        if arr[i] != arr[i - 1] + 1:
-            # End of the current interval
-            end = arr[i - 1]
-            # Add the interval as a tuple
-            intervals.append((start, end + 1))
-            # Start a new interval
-            start = arr[i]
-
-    # Add the last interval
-    intervals.append((start, arr[-1] + 1))
-
-    return intervals
+    Vectorized with np.diff; the array of empty slots can hold up to
+    the whole buffer, so a Python scan over it is measurable on the
+    data-loading path.
+    """
+    breaks = np.nonzero(np.diff(arr) != 1)[0]
+    start = arr[breaks[-1] + 1] if len(breaks) > 0 else arr[0]
+    return int(start), int(arr[-1]) + 1
 
 
 class BufferFull(Exception):
@@ -87,21 +73,30 @@ class _TensorDictSequenceBuffer:
         return self.__hash_vals[indices]
 
     def _update_has_keys(self, indices: List[int]):
+        # Samples of one batch nearly always share the same key set, so
+        # compute the membership mask once per distinct set and write it
+        # to all corresponding rows in bulk instead of per sample.
+        groups: Dict[Tuple[str, ...], List[int]] = {}
         for idx in indices:
-            self.__has_keys[idx] = [k in self.__storage[idx].keys for k in self.__keys]
+            groups.setdefault(tuple(self.__storage[idx].keys), []).append(idx)
+        for keys, idxs in groups.items():
+            mask = np.array([k in keys for k in self.__keys], dtype=bool)
+            self.__has_keys[np.asarray(idxs)] = mask
 
     def _get_has_keys(self, indices):
         return self.__has_keys[indices, :]
 
     def put_batch(self, indices: List[int], xs: List[Tuple[List[str], int, int]]):
         assert len(indices) == len(xs)
-        # Can be parallelized.
+        receive_time = time.time()
         for idx, x in zip(indices, xs):
             keys, seqlen, hash_val = x
             self.__storage[idx] = _ReplayEntry(
                 reuses_left=self.__reuses,
-                receive_time=time.time(),
-                keys=copy.deepcopy(keys),
+                receive_time=receive_time,
+                # Keys are plain strings; a shallow copy gives each entry
+                # its own list for amend_batch to extend.
+                keys=list(keys),
                 seqlen=seqlen,
                 hash_val=hash_val,
             )
@@ -225,7 +220,9 @@ class AsyncIOSequenceBuffer:
             self._assert_valid_indicator()
             n = len(samples)
             indices = np.where(self._is_empty)[0]
-            indices = np.arange(*_extract_intervals(indices)[-1])[:n]
+            if len(indices) == 0:
+                raise BufferFull("Please set a larger buffer size")
+            indices = np.arange(*_last_contiguous_interval(indices))[:n]
             if len(indices) < n:
                 raise BufferFull("Please set a larger buffer size")
             self._is_empty[indices] = False
@@ -306,25 +303,23 @@ class AsyncIOSequenceBuffer:
 
     async def get_batch_for_rpc(self, rpc: dfg.MFCDef) -> SequenceSample:
         rpc_idx = self._rpc_names.index(rpc.name)
+        # The ready set is recomputed on every wakeup; cache the last
+        # result so the post-wait code path reuses it instead of running
+        # the full-buffer boolean reduction a third time.
+        ready_indices: np.ndarray = None
 
         def _can_do_rpc() -> bool:
+            nonlocal ready_indices
             ready_indices = np.nonzero(
                 (self._is_idle | self._is_being_read)
                 & self._ready_for_rpcs[:, rpc_idx]
                 & ~self._completed_rpc[:, rpc_idx]
             )[0]
-            if len(ready_indices) < rpc.min_n_seqs:
-                return False
-            return True
+            return len(ready_indices) >= rpc.min_n_seqs
 
         async with self._lock:
-            # await self._lock.wait_for(_can_do_rpc)
             if rpc.is_src:
-                ready_indices = np.nonzero(
-                    (self._is_idle | self._is_being_read)
-                    & self._ready_for_rpcs[:, rpc_idx]
-                    & ~self._completed_rpc[:, rpc_idx]
-                )[0]
+                _can_do_rpc()
                 # *2 because we want to fetch new data as long as the *next* RPC does not have enough data.
                 if len(ready_indices) < rpc.min_n_seqs * 2:
                     self._request_load_data()
@@ -334,11 +329,6 @@ class AsyncIOSequenceBuffer:
 
             self._assert_valid_indicator()
 
-            ready_indices = np.nonzero(
-                (self._is_idle | self._is_being_read)
-                & self._ready_for_rpcs[:, rpc_idx]
-                & ~self._completed_rpc[:, rpc_idx]
-            )[0]
             seqlens = self.__buffer._get_seqlen(ready_indices)
             hash_vals = self.__buffer._get_hash_val(ready_indices)
 
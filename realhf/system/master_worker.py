@@ -1,14 +1,15 @@
 import asyncio
 import collections
-import copy
 import dataclasses
+import gc
 import getpass
 import itertools
 import os
-import re
+import pprint
 import time
 import uuid
 from collections import defaultdict
+from operator import itemgetter
 from typing import Dict, List, Optional, Set, Tuple, Union
 
 import colorama
@@ -16,6 +17,12 @@ import deepspeed
 import numpy as np
 import torch
 import torch.distributed
+import zmq
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 import realhf.api.core.config as config_api
 import realhf.api.core.data_api as data_api
@@ -28,18 +35,8 @@ import realhf.system.worker_base as worker_base
 from realhf.api.core.config import ModelName
 from realhf.api.core.model_api import ReaLModelConfig
 from realhf.base import datapack, logging, namedarray, timeutil, topology
-from realhf.base.asyncio_utils import (
-    raise_asyncio_exception,
-    setup_run_until_complete,
-    teardown_run_util_complete,
-)
 from realhf.base.cluster import spec as cluster_spec
 from realhf.base.constants import MODEL_SAVE_ROOT
-from realhf.base.monitor import (
-    caculuate_llama_forward_flops,
-    calculate_llama_gen_flops,
-    calculate_llama_train_flops,
-)
 from realhf.system.buffer import AsyncIOSequenceBuffer
 
 logger = logging.getLogger("master worker", "system")
@@ -65,13 +62,79 @@ class ExperimentComplete(Exception):
         )
 
 
-def request_all(
-    stream: request_reply_stream.NameResolvingRequstClient,
+class ReplyDemux:
+    """Event-driven demultiplexer of stream replies.
+
+    A single background task drains the stream and resolves per-request
+    futures keyed by request id. Coroutines awaiting a reply simply await
+    their future instead of each polling the stream with its own
+    sleep(0.01) loop, which burns CPU and adds up to 10ms of tail latency
+    per reply when hundreds of shard replies are gathered concurrently.
+
+    Replies that no coroutine has registered for stay in the stream's
+    response buffer, so synchronous ``stream.poll`` call sites (e.g.,
+    during initialization) observe them as before.
+    """
+
+    def __init__(self, stream: request_reply_stream.NameResolvingRequstClient):
+        self.stream = stream
+        self._futures: Dict[uuid.UUID, asyncio.Future] = {}
+
+    async def wait(self, request_id: uuid.UUID) -> request_reply_stream.Payload:
+        """Wait until the response with the given request id arrives."""
+        payload = self.stream.try_pop(request_id)
+        if payload is not None:
+            return payload
+        fut = asyncio.get_running_loop().create_future()
+        self._futures[request_id] = fut
+        try:
+            return await fut
+        finally:
+            self._futures.pop(request_id, None)
+
+    async def run(self):
+        """Drain the stream and dispatch replies to pending futures."""
+        loop = asyncio.get_running_loop()
+        # Wake up on actual socket readiness instead of a fixed tick. The
+        # ZMQ file descriptor is edge-triggered, so pump() must drain the
+        # socket completely after each wakeup, and a coarse timeout guards
+        # against edges missed between draining and waiting.
+        readable = asyncio.Event()
+        fd = self.stream.recv_socket.getsockopt(zmq.FD)
+        loop.add_reader(fd, readable.set)
+        try:
+            while True:
+                new_ids = self.stream.pump()
+                for req_id in new_ids:
+                    fut = self._futures.get(req_id)
+                    if fut is not None and not fut.done():
+                        fut.set_result(self.stream.try_pop(req_id))
+                if new_ids:
+                    # Yield to awakened coroutines, then drain again.
+                    await asyncio.sleep(0)
+                    continue
+                readable.clear()
+                try:
+                    await asyncio.wait_for(readable.wait(), timeout=0.05)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            loop.remove_reader(fd)
+
+
+async def request_all_async(
+    demux: ReplyDemux,
     handlers: List[str],
     handle_type: str,
     datas: List[namedarray.NamedArray],
     verbose: bool = True,
 ):
+    """Asynchronous counterpart of :func:`request_all`.
+
+    Handshakes run over the reply demultiplexer instead of blocking
+    polls, so concurrent coroutines (and their group RPCs) can progress
+    while syns are in flight.
+    """
     requests = [
         request_reply_stream.Payload(
             handler=handler,
@@ -84,20 +147,13 @@ def request_all(
         blogger.debug(f"master worker #request_all# *end* time ${time.time_ns()}$")
     tik = time.perf_counter()
 
-    # A protocol to ensure that any model worker execute jobs in the same order.
-    [stream.post(r) for r in requests]
-    [
-        stream.poll(block=True, pattern=create_exact_match_pattern([p.syn_reply_id]))
-        for p in requests
-    ]
-    [
-        stream.post(
-            request_reply_stream.Payload(
-                handler=r.handler, handle_name="ack", request_id=r.ack_reply_id
-            )
-        )
-        for r in requests
-    ]
+    demux.stream.post_many(requests)
+
+    async def _handshake(r: request_reply_stream.Payload):
+        await demux.wait(r.syn_reply_id)
+        demux.stream.post_acks([(r.handler, r.ack_reply_id)])
+
+    await asyncio.gather(*[_handshake(r) for r in requests])
     t = time.perf_counter() - tik
 
     if verbose:
@@ -108,36 +164,13 @@ def request_all(
     return [r.request_id for r in requests]
 
 
-def create_exact_match_pattern(string_list: List[Union[uuid.UUID, str]]) -> re.Pattern:
-    escaped_strings = [re.escape(str(s)) for s in string_list]
-    pattern = f"({'|'.join(escaped_strings)})$"
-    return re.compile(pattern)
-
-
-async def _awaitable_response(
-    stream: request_reply_stream.NameResolvingRequstClient,
-    pattern: re.Pattern | None,
-) -> request_reply_stream.Payload:
-    while True:
-        try:
-            return stream.poll(pattern=pattern, block=False)
-        except request_reply_stream.NoMessage:
-            await asyncio.sleep(0.01)
-            continue
-
-
 async def gather_all_replies(
-    stream: request_reply_stream.NameResolvingRequstClient,
+    demux: ReplyDemux,
     request_ids: List[str],
     verbose: bool = True,
 ) -> List:
     """Collect responses from multiple streams. Blocking method."""
-    responses = await asyncio.gather(
-        *[
-            _awaitable_response(stream, pattern=create_exact_match_pattern([req_id]))
-            for req_id in request_ids
-        ]
-    )
+    responses = await asyncio.gather(*[demux.wait(req_id) for req_id in request_ids])
     if verbose:
         blogger.debug(
             f"master worker #gather_all_replies# *end* time ${time.time_ns()}$"
@@ -146,24 +179,26 @@ async def gather_all_replies(
 
 
 async def group_rpc_blocked(
-    stream: request_reply_stream.NameResolvingRequstClient,
+    demux: ReplyDemux,
     handlers: List[Union[config_pkg.ModelShardID, str]],
     handle_type: str,
     datas: List[namedarray.NamedArray],
     verbose: bool = True,
 ) -> List[namedarray.NamedArray]:
     payloads = await gather_all_replies(
-        stream,
-        request_all(stream, handlers, handle_type, datas, verbose=verbose),
+        demux,
+        await request_all_async(demux, handlers, handle_type, datas, verbose=verbose),
     )
     return [p.data for p in payloads]
 
 
-def _request_parameter_sync(
-    stream: request_reply_stream.NameResolvingRequstClient,
+async def _request_parameter_sync(
+    demux: ReplyDemux,
     msid2mwid: Dict[config_pkg.ModelShardID, int],
     from_model_name: ModelName,
     to_model_name: ModelName,
+    from_handlers: List[config_pkg.ModelShardID],
+    to_handlers: List[config_pkg.ModelShardID],
     from_topo: topology.PipeModelDataParallelTopology,
     to_topo: topology.PipeModelDataParallelTopology,
     to_model_config: ReaLModelConfig,
@@ -175,16 +210,11 @@ def _request_parameter_sync(
     # As a result, if both `from_model` and `to_model` reside in a model worker,
     # the handler in the received request will be `from_model`. Layers will also built in `from_model`.
     # After that, we assign layers of the `from_model` to `to_model`.
-    handlers = [
-        config_pkg.ModelShardID.from_parallelism_rank(model_name, from_topo, j)
-        for j in range(from_topo.world_size())
-    ]
+    # The caller passes handler lists precomputed per topo, so no shard
+    # ids are reconstructed here.
+    handlers = list(from_handlers)
     all_handler_mwids = set([msid2mwid[h] for h in handlers])
-    dst_handlers = [
-        config_pkg.ModelShardID.from_parallelism_rank(target, to_topo, j)
-        for j in range(to_topo.world_size())
-    ]
-    for h in dst_handlers:
+    for h in to_handlers:
         if msid2mwid[h] not in all_handler_mwids:
             handlers.append(h)
             all_handler_mwids.add(msid2mwid[h])
@@ -205,49 +235,65 @@ def _request_parameter_sync(
         )
         for h in handlers
     ]
-    request_ids = [stream.post(p) for p in payloads]
-    [
-        stream.poll(pattern=create_exact_match_pattern([p.syn_reply_id]), block=True)
-        for p in payloads
-    ]
-    [
-        stream.post(
-            request_reply_stream.Payload(
-                handler=p.handler, handle_name="ack", request_id=p.ack_reply_id
-            )
-        )
-        for p in payloads
-    ]
-    [
-        stream.poll(pattern=create_exact_match_pattern([req_id]), block=True)
-        for req_id in request_ids
-    ]
+    demux.stream.post_many(payloads)
+
+    async def _handshake(p: request_reply_stream.Payload):
+        await demux.wait(p.syn_reply_id)
+        demux.stream.post_acks([(p.handler, p.ack_reply_id)])
+
+    await asyncio.gather(*[_handshake(p) for p in payloads])
+    await asyncio.gather(*[demux.wait(p.request_id) for p in payloads])
 
 
 @dataclasses.dataclass
 class InterfaceDataAmount:
+    """FLOPs accounting of one training step in structure-of-arrays form.
+
+    The closed-form LLaMA FLOPs formulas only need the token count and the
+    sum of squared sequence lengths of each micro-batch, so producers
+    append those two scalars instead of whole seqlen lists, and ``_poll``
+    reduces everything with vectorized NumPy expressions instead of one
+    Python call into ``realhf.base.monitor`` per micro-batch.
+    """
+
     train_configs: List[ReaLModelConfig] = dataclasses.field(default_factory=list)
     train_bs: List[int] = dataclasses.field(default_factory=list)
-    train_seqlens: List[List[int]] = dataclasses.field(default_factory=list)
+    train_tokens: List[int] = dataclasses.field(default_factory=list)
+    train_sq_tokens: List[int] = dataclasses.field(default_factory=list)
 
     inf_configs: List[ReaLModelConfig] = dataclasses.field(default_factory=list)
     inf_bs: List[int] = dataclasses.field(default_factory=list)
-    inf_seqlens: List[List[int]] = dataclasses.field(default_factory=list)
+    inf_tokens: List[int] = dataclasses.field(default_factory=list)
+    inf_sq_tokens: List[int] = dataclasses.field(default_factory=list)
 
     gen_configs: List[ReaLModelConfig] = dataclasses.field(default_factory=list)
     gen_bs: List[int] = dataclasses.field(default_factory=list)
-    prompt_lens: List[List[int]] = dataclasses.field(default_factory=list)
+    prompt_tokens: List[int] = dataclasses.field(default_factory=list)
+    prompt_sq_tokens: List[int] = dataclasses.field(default_factory=list)
     gen_len: List[int] = dataclasses.field(default_factory=list)
 
+    def record(self, category: str, seqlens: List[int]):
+        """Append the batch size and token statistics of one micro-batch."""
+        seqlens_arr = np.asarray(seqlens, dtype=np.int64)
+        getattr(self, f"{category}_bs").append(len(seqlens))
+        tokens_key = "prompt" if category == "gen" else category
+        getattr(self, f"{tokens_key}_tokens").append(int(seqlens_arr.sum()))
+        getattr(self, f"{tokens_key}_sq_tokens").append(
+            int((seqlens_arr**2).sum())
+        )
+
     def clear(self):
         self.train_bs.clear()
-        self.train_seqlens.clear()
+        self.train_tokens.clear()
+        self.train_sq_tokens.clear()
 
         self.inf_bs.clear()
-        self.inf_seqlens.clear()
+        self.inf_tokens.clear()
+        self.inf_sq_tokens.clear()
 
         self.gen_bs.clear()
-        self.prompt_lens.clear()
+        self.prompt_tokens.clear()
+        self.prompt_sq_tokens.clear()
         self.gen_len.clear()
 
         self.train_configs.clear()
@@ -255,6 +301,88 @@ class InterfaceDataAmount:
         self.gen_configs.clear()
 
 
+class DataOwnerTable:
+    """Structure-of-arrays record of which (model, DP rank) owns buffer entries.
+
+    For every data key, the owner is stored in two flat arrays indexed by
+    buffer index: an int16 id of the interned producer model name and an
+    int32 DP rank. Reading or writing the owners of a whole batch of buffer
+    indices is a vectorized NumPy operation instead of a Python loop over
+    tuple-keyed dict entries, which used to dominate the per-step setup
+    time of ``model_rpc_request_func``.
+    """
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._names: List[ModelName] = []
+        self._name_ids: Dict[ModelName, int] = {}
+        self._producers: Dict[str, np.ndarray] = {}
+        self._dp_ranks: Dict[str, np.ndarray] = {}
+
+    def _arrays(self, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        if key not in self._producers:
+            self._producers[key] = np.full(self._capacity, -1, dtype=np.int16)
+            self._dp_ranks[key] = np.full(self._capacity, -1, dtype=np.int32)
+        return self._producers[key], self._dp_ranks[key]
+
+    def _intern(self, model_name: ModelName) -> int:
+        name_id = self._name_ids.get(model_name)
+        if name_id is None:
+            name_id = self._name_ids[model_name] = len(self._names)
+            self._names.append(model_name)
+        return name_id
+
+    def set_owner(
+        self,
+        key: str,
+        buf_indices: Union[int, np.ndarray],
+        model_name: ModelName,
+        dp_idx: Union[int, np.ndarray],
+    ):
+        """Record the owner of the given buffer indices for one data key."""
+        producers, dp_ranks = self._arrays(key)
+        producers[buf_indices] = self._intern(model_name)
+        dp_ranks[buf_indices] = dp_idx
+
+    def get_owner(
+        self, key: str, buf_indices: np.ndarray
+    ) -> Tuple[ModelName, np.ndarray]:
+        """Return the producer and per-entry DP ranks of the given indices.
+
+        All entries of one key in a batch must have the same producer.
+        """
+        producers, dp_ranks = self._arrays(key)
+        name_ids = producers[buf_indices]
+        assert name_ids[0] >= 0 and (name_ids == name_ids[0]).all(), key
+        return self._names[name_ids[0]], dp_ranks[buf_indices]
+
+
+class LiteQueue:
+    """A deque-plus-event stand-in for per-coroutine ``asyncio.Queue(1)``s.
+
+    Request ids flow from one request coroutine to the reply coroutines
+    of the same RPC. Puts can never block -- in-flight calls are bounded
+    upstream by the ``can_do_rpc`` semaphore -- so the queue's lock and
+    per-slot waiter machinery is pure overhead. A single shared queue
+    also removes the producer-side round robin: any idle reply coroutine
+    picks up the next pending call.
+    """
+
+    def __init__(self):
+        self._buf = collections.deque()
+        self._not_empty = asyncio.Event()
+
+    def put_nowait(self, x):
+        self._buf.append(x)
+        self._not_empty.set()
+
+    async def get(self):
+        while not self._buf:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._buf.popleft()
+
+
 @dataclasses.dataclass
 class RPCCorountineControl:
     ## Shared resources ##
@@ -273,7 +401,7 @@ class RPCCorountineControl:
     can_do_rpc: Dict[str, asyncio.Semaphore]
     rpc_traversal: Dict[str, int]
     # for synchronizing req ids between req and reply coroutines
-    request_queues: Dict[str, List[asyncio.Queue]]
+    request_queues: Dict[str, LiteQueue]
 
     training_buffer_indices: Set[int] = dataclasses.field(default_factory=set)
     data_amount: InterfaceDataAmount = dataclasses.field(
@@ -286,97 +414,256 @@ class RPCCorountineControl:
     hash_vals_to_ignore_in_recover: Set[int] = dataclasses.field(default_factory=set)
 
 
-def _attach_payloads_with_hooks(
+def _rpc_producer_names(rpc: dfg.MFCDef, src_rpc_model_name: ModelName) -> Dict:
+    """Map each input data key of an RPC to its producer model name."""
+    producer_names = {}
+    for k in rpc.input_data:
+        if k in rpc.data_producers:
+            producer_names[k] = rpc.data_producers[k]
+        else:
+            producer_names[k] = src_rpc_model_name
+    return producer_names
+
+
+@dataclasses.dataclass
+class RPCHookPlan:
+    """Precomputed hook attachment for one (RPC, pre/post) pair.
+
+    RPC hooks, topologies, and model configs are static after model
+    initialization, so the extra handlers and hook data dicts they induce
+    can be materialized once (see :func:`make_rpc_hook_plans`) instead of
+    being re-derived from the topology on every RPC step.
+    """
+
+    hook_type: str
+    main_handlers: List[config_pkg.ModelShardID]
+    # Hook (name, data) pairs appended to every main payload, in order.
+    main_appends: List[Tuple[str, Dict]]
+    # Handlers on model workers not covered by existing payloads; an empty
+    # payload carrying the listed hooks is created for each.
+    extra_payloads: Dict[config_pkg.ModelShardID, List[Tuple[str, Dict]]]
+    # Hooks piggy-backed onto the existing payloads of other handlers.
+    shared_appends: Dict[config_pkg.ModelShardID, List[Tuple[str, Dict]]]
+
+
+def make_rpc_hook_plans(
     rpc: dfg.MFCDef,
-    payloads: Dict[config_api.ModelShardID, request_reply_stream.Payload],
-    mwids: List[int],
+    base_handlers: List[config_pkg.ModelShardID],
+    main_handlers: List[config_pkg.ModelShardID],
     msid2mwid: Dict[config_pkg.ModelShardID, int],
     model_configs: Dict[str, None | ReaLModelConfig],
     model_topos: Dict[str, topology.PipeModelDataParallelTopology],
-    main_handlers: List[config_pkg.ModelShardID],
-    hook_type: str,
-) -> Tuple[Dict[config_api.ModelShardID, request_reply_stream.Payload], List[int]]:
-    assert hook_type in ["pre", "post"], hook_type
-
-    main_mwids = set([msid2mwid[h] for h in main_handlers])
-    for hook in getattr(rpc, f"{hook_type}_hooks"):
-        if isinstance(hook, dfg.SyncParamHook):
-            assert (hook.source is None) != (hook.target is None), hook
-            if hook.source is None:
-                src_topo = model_topos[rpc.model_name]
-                dst_topo = model_topos[hook.target]
-                dst_config = model_configs[hook.target]
-                src_model_name, dst_model_name = rpc.model_name, hook.target
-                other_model_name = hook.target
-                other_topo = dst_topo
+    handlers_by_model: Dict[ModelName, List[config_pkg.ModelShardID]],
+) -> Dict[str, RPCHookPlan]:
+    """Resolve pre/post hooks of one RPC into static attachment plans.
+
+    ``base_handlers`` are the handlers that receive a payload before hook
+    attachment, i.e., the main handlers plus the producer DP heads added
+    by :func:`scatter_tensor_to_mws`.
+    """
+    main_mwids = set(msid2mwid[h] for h in main_handlers)
+    # Which handler owns the payload of each covered model worker.
+    handler_by_mwid = {msid2mwid[h]: h for h in base_handlers}
+
+    plans = {}
+    for hook_type in ["pre", "post"]:
+        main_appends = []
+        extra_payloads = defaultdict(list)
+        shared_appends = defaultdict(list)
+        for hook in getattr(rpc, f"{hook_type}_hooks"):
+            if isinstance(hook, dfg.SyncParamHook):
+                assert (hook.source is None) != (hook.target is None), hook
+                if hook.source is None:
+                    src_topo = model_topos[rpc.model_name]
+                    dst_topo = model_topos[hook.target]
+                    dst_config = model_configs[hook.target]
+                    src_model_name, dst_model_name = rpc.model_name, hook.target
+                    other_model_name = hook.target
+                else:
+                    src_topo = model_topos[hook.source]
+                    dst_topo = model_topos[rpc.model_name]
+                    dst_config = model_configs[rpc.model_name]
+                    src_model_name, dst_model_name = hook.source, rpc.model_name
+                    other_model_name = hook.source
+
+                ps_data = {
+                    "from_model_name": src_model_name,
+                    "to_model_name": dst_model_name,
+                    "from_topo": src_topo,
+                    "to_topo": dst_topo,
+                    "to_model_config": dst_config,
+                }
+                main_appends.append(("param_realloc", ps_data))
+                for h in handlers_by_model[other_model_name]:
+                    mwid = msid2mwid[h]
+                    if mwid not in handler_by_mwid:
+                        extra_payloads[h].append(("param_realloc", ps_data))
+                        handler_by_mwid[mwid] = h
+                    elif mwid not in main_mwids:
+                        hh = handler_by_mwid[mwid]
+                        if hh in extra_payloads:
+                            extra_payloads[hh].append(("param_realloc", ps_data))
+                        else:
+                            shared_appends[hh].append(("param_realloc", ps_data))
+            elif isinstance(hook, dfg.OffloadHook):
+                main_appends.append(("offload", dict(model_name=rpc.model_name)))
             else:
-                src_topo = model_topos[hook.source]
-                dst_topo = model_topos[rpc.model_name]
-                dst_config = model_configs[rpc.model_name]
-                src_model_name, dst_model_name = hook.source, rpc.model_name
-                other_model_name = hook.source
-                other_topo = src_topo
-
-            ps_data = {
-                "from_model_name": src_model_name,
-                "to_model_name": dst_model_name,
-                "from_topo": src_topo,
-                "to_topo": dst_topo,
-                "to_model_config": dst_config,
-            }
-            for h in main_handlers:
-                getattr(payloads[h], f"{hook_type}_hooks").append("param_realloc")
-                getattr(payloads[h], f"{hook_type}_hook_data").append(ps_data)
-            other_handlers = [
-                config_api.ModelShardID.from_parallelism_rank(
-                    other_model_name, other_topo, j
-                )
-                for j in range(other_topo.world_size())
-            ]
-            for h in other_handlers:
-                if msid2mwid[h] not in mwids:
-                    payloads[h] = request_reply_stream.Payload(
-                        handler=h,
-                        handle_name="empty",
-                    )
-                    setattr(payloads[h], f"{hook_type}_hooks", ["param_realloc"])
-                    setattr(payloads[h], f"{hook_type}_hook_data", [ps_data])
-                    mwids.append(msid2mwid[h])
-                elif msid2mwid[h] not in main_mwids:
-                    hh = next(hh for hh in payloads if msid2mwid[hh] == msid2mwid[h])
-                    getattr(payloads[hh], f"{hook_type}_hooks").append("param_realloc")
-                    getattr(payloads[hh], f"{hook_type}_hook_data").append(ps_data)
-
-        elif isinstance(hook, dfg.OffloadHook):
+                raise NotImplementedError(f"Unknown hook type: {hook}")
+        plans[hook_type] = RPCHookPlan(
+            hook_type=hook_type,
+            main_handlers=main_handlers,
+            main_appends=main_appends,
+            extra_payloads=dict(extra_payloads),
+            shared_appends=dict(shared_appends),
+        )
+    return plans
+
+
+@dataclasses.dataclass
+class PayloadTemplate:
+    """Static skeleton of one payload posted by :func:`scatter_tensor_to_mws`."""
+
+    handler: config_pkg.ModelShardID
+    handle_name: str
+    # Whether the payload carries the per-step data transfer hook data.
+    data_transfer: bool
+    pre_hooks: List[str]
+    pre_hook_data: List[Dict]
+    post_hooks: List[str]
+    post_hook_data: List[Dict]
+
+
+@dataclasses.dataclass
+class RPCScatterPlan:
+    """Everything about an RPC's scatter that does not change across steps.
+
+    The handler set, handle names, and hook attachments of a scatter are
+    fully determined by the dataflow graph, topologies, and model configs.
+    This plan materializes them once (see :func:`make_scatter_plan`), so
+    each step only instantiates payloads and swaps in the per-step data.
+    """
+
+    producer_names: Dict[str, str]  # data key -> producer model name
+    # Producer model name -> the handlers that hold its data.
+    producer_name2producer_handlers: Dict[str, List[config_pkg.ModelShardID]]
+    # Main (RPC-executing) handlers come first in the template order.
+    n_main: int
+    templates: List[PayloadTemplate]
+
+
+def make_scatter_plan(
+    rpc: dfg.MFCDef,
+    src_rpc_model_name: ModelName,
+    msid2mwid: Dict[config_pkg.ModelShardID, int],
+    model_configs: Dict[str, None | ReaLModelConfig],
+    model_topos: Dict[str, topology.PipeModelDataParallelTopology],
+    handlers_by_model: Dict[ModelName, List[config_pkg.ModelShardID]],
+) -> RPCScatterPlan:
+    main_handlers = handlers_by_model[rpc.model_name]
+    main_mwids = [msid2mwid[h] for h in main_handlers]
+    assert len(main_mwids) == len(set(main_mwids))
+
+    producer_names = _rpc_producer_names(rpc, src_rpc_model_name)
+    producer_name2producer_handlers = {
+        producer_name: handlers_by_model[producer_name]
+        for producer_name in set(producer_names.values())
+    }
+
+    # Handlers covered by payloads before hook attachment: the main
+    # handlers plus producer handlers on uncovered model workers.
+    base_handlers = list(main_handlers)
+    base_mwids = set(main_mwids)
+    for producer_name in producer_names.values():
+        for h in handlers_by_model[producer_name]:
+            mwid = msid2mwid[h]
+            if mwid not in base_mwids:
+                base_handlers.append(h)
+                base_mwids.add(mwid)
+
+    hook_plans = make_rpc_hook_plans(
+        rpc,
+        base_handlers=base_handlers,
+        main_handlers=main_handlers,
+        msid2mwid=msid2mwid,
+        model_configs=model_configs,
+        model_topos=model_topos,
+        handlers_by_model=handlers_by_model,
+    )
+
+    templates: Dict[config_pkg.ModelShardID, PayloadTemplate] = {}
+    for h in main_handlers:
+        templates[h] = PayloadTemplate(
+            handler=h,
+            handle_name=rpc.interface_type.value,
+            data_transfer=True,
+            pre_hooks=["data_transfer"],
+            pre_hook_data=[],
+            post_hooks=[],
+            post_hook_data=[],
+        )
+    for h in base_handlers[len(main_handlers) :]:
+        templates[h] = PayloadTemplate(
+            handler=h,
+            handle_name="empty",
+            data_transfer=True,
+            pre_hooks=["data_transfer"],
+            pre_hook_data=[],
+            post_hooks=[],
+            post_hook_data=[],
+        )
+    for plan in [hook_plans["pre"], hook_plans["post"]]:
+        hooks_attr = f"{plan.hook_type}_hooks"
+        data_attr = f"{plan.hook_type}_hook_data"
+        for hook_name, hook_data in plan.main_appends:
             for h in main_handlers:
-                getattr(payloads[h], f"{hook_type}_hooks").append("offload")
-                getattr(payloads[h], f"{hook_type}_hook_data").append(
-                    dict(model_name=h.model_name)
+                getattr(templates[h], hooks_attr).append(hook_name)
+                getattr(templates[h], data_attr).append(hook_data)
+        for h, hook_list in plan.extra_payloads.items():
+            if h not in templates:
+                templates[h] = PayloadTemplate(
+                    handler=h,
+                    handle_name="empty",
+                    data_transfer=False,
+                    pre_hooks=[],
+                    pre_hook_data=[],
+                    post_hooks=[],
+                    post_hook_data=[],
                 )
-        else:
-            raise NotImplementedError(f"Unknown hook type: {hook}")
-    return payloads, mwids
+            for hook_name, hook_data in hook_list:
+                getattr(templates[h], hooks_attr).append(hook_name)
+                getattr(templates[h], data_attr).append(hook_data)
+        for hh, hook_list in plan.shared_appends.items():
+            for hook_name, hook_data in hook_list:
+                getattr(templates[hh], hooks_attr).append(hook_name)
+                getattr(templates[hh], data_attr).append(hook_data)
+
+    return RPCScatterPlan(
+        producer_names=producer_names,
+        producer_name2producer_handlers=producer_name2producer_handlers,
+        n_main=len(main_handlers),
+        templates=list(templates.values()),
+    )
 
 
 async def scatter_tensor_to_mws(
     rpc: dfg.MFCDef,
-    stream: request_reply_stream.NameResolvingRequstClient,
-    msid2mwid: Dict[config_pkg.ModelShardID, int],
-    model_topos: Dict[str, topology.PipeModelDataParallelTopology],
-    model_configs: Dict[str, None | ReaLModelConfig],
-    producer_names: Dict[str, str],
-    producer_name2producer_handlers: Dict[str, List[config_pkg.ModelShardID]],
+    demux: ReplyDemux,
+    plan: RPCScatterPlan,
     producer_mappings: Dict[str, Dict[str, List[int]]],
     target_mapping: Dict[str, List[int]],
     buffer_indices: List[int],
     seqlens: List[int],
-    handlers: List[config_pkg.ModelShardID],
 ) -> List[uuid.UUID]:
 
+    # Built once and shared by reference across all payloads of this step.
+    # Workers treat hook data as read-only, and the batched pickle in
+    # post_many memoizes the first occurrence, so the (potentially large)
+    # producer/target mappings are serialized once per destination socket
+    # instead of once per handler.
     dt_data = {
         "keys": rpc.input_data,
         "target": rpc.model_name,
-        "producer_names": producer_names,
+        "producer_names": plan.producer_names,
         "producer_mappings": producer_mappings,
         "target_mapping": target_mapping,
         "handle_name": rpc.interface_type.value,
@@ -387,111 +674,65 @@ async def scatter_tensor_to_mws(
         "seqlens": seqlens,
     }
 
-    payloads = {
-        handler: request_reply_stream.Payload(
-            handler=handler,
-            handle_name=rpc.interface_type.value,
-            pre_hooks=["data_transfer"],
-            pre_hook_data=[dt_data],
-        )
-        for handler in handlers
-    }
-    mwids = [msid2mwid[h] for h in handlers]
-    assert len(mwids) == len(set(mwids))
-
-    for producer_name in producer_names.values():
-        for h in producer_name2producer_handlers[producer_name]:
-            if msid2mwid[h] not in mwids:
-                payloads[h] = request_reply_stream.Payload(
-                    handler=h,
-                    handle_name="empty",
-                    pre_hooks=["data_transfer"],
-                    pre_hook_data=[dt_data],
-                )
-                mwids.append(msid2mwid[h])
-
-    payloads, mwids = _attach_payloads_with_hooks(
-        rpc,
-        payloads,
-        mwids,
-        msid2mwid=msid2mwid,
-        model_configs=model_configs,
-        model_topos=model_topos,
-        main_handlers=handlers,
-        hook_type="pre",
-    )
-    payloads, mwids = _attach_payloads_with_hooks(
-        rpc,
-        payloads,
-        mwids,
-        msid2mwid=msid2mwid,
-        model_configs=model_configs,
-        model_topos=model_topos,
-        main_handlers=handlers,
-        hook_type="post",
-    )
-    req_ids = [stream.post(p) for h, p in payloads.items() if h in handlers]
-    other_req_ids = [stream.post(p) for h, p in payloads.items() if h not in handlers]
-    await asyncio.gather(
-        *[
-            _awaitable_response(
-                stream, pattern=create_exact_match_pattern([p.syn_reply_id])
-            )
-            for p in payloads.values()
-        ]
-    )
-    [
-        stream.post(
-            request_reply_stream.Payload(
-                handler=p.handler, handle_name="ack", request_id=p.ack_reply_id
-            )
+    # Hook lists are copied because model workers pop from them; the hook
+    # data dicts themselves are shared and read-only.
+    payloads = [
+        request_reply_stream.Payload(
+            handler=t.handler,
+            handle_name=t.handle_name,
+            pre_hooks=list(t.pre_hooks),
+            pre_hook_data=(
+                [dt_data] + t.pre_hook_data
+                if t.data_transfer
+                else list(t.pre_hook_data)
+            ),
+            post_hooks=list(t.post_hooks),
+            post_hook_data=list(t.post_hook_data),
         )
-        for p in payloads.values()
+        for t in plan.templates
     ]
+    stream = demux.stream
+    # A single post covering all payloads lets those bound for the same
+    # socket share one message and one pickle memo table.
+    all_req_ids = stream.post_many(payloads)
+    req_ids = all_req_ids[: plan.n_main]
+    other_req_ids = all_req_ids[plan.n_main :]
+    # Fused handshake: post each ack the moment its syn arrives instead
+    # of serializing all syn waits before the first ack goes out. Syns
+    # from many handlers typically land in one socket drain, so acks
+    # ready within the same event-loop tick are coalesced into a single
+    # batched post; the batching window is one tick, adding no latency.
+    pending_acks: List[Tuple[Any, uuid.UUID]] = []
+
+    async def _handshake(p: request_reply_stream.Payload):
+        await demux.wait(p.syn_reply_id)
+        pending_acks.append((p.handler, p.ack_reply_id))
+        if len(pending_acks) == 1:
+            # First completer of this tick flushes after yielding once,
+            # picking up every ack appended by its peers in between.
+            await asyncio.sleep(0)
+            batch = list(pending_acks)
+            pending_acks.clear()
+            stream.post_acks(batch)
+
+    await asyncio.gather(*[_handshake(p) for p in payloads])
     return req_ids, other_req_ids
 
 
 async def model_rpc_request_func(
     rpc: dfg.MFCDef,
-    msid2mwid: Dict[config_pkg.ModelShardID, int],
-    src_rpc_model_name: ModelName,
-    stream: request_reply_stream.NameResolvingRequstClient,
+    demux: ReplyDemux,
     buffer: AsyncIOSequenceBuffer,
-    data_owner: Dict[Tuple[int, str], Tuple[str, int]],
+    data_owner: DataOwnerTable,
     model_topos: Dict[str, topology.PipeModelDataParallelTopology],
     model_configs: Dict[str, None | ReaLModelConfig],
+    scatter_plan: RPCScatterPlan,
     ctrl: RPCCorountineControl,
 ):
     topo = model_topos[rpc.model_name]
-    handlers = [
-        config_pkg.ModelShardID.from_parallelism_rank(rpc.model_name, topo, j)
-        for j in range(topo.world_size())
-    ]
-
-    producer_names = {}  # data key -> model name
-    for k in rpc.input_data:
-        if k in rpc.data_producers:
-            producer_names[k] = rpc.data_producers[k]
-        else:
-            producer_names[k] = src_rpc_model_name
-    keys_to_send = defaultdict(list)  # model name -> List[keys] to send
-    for k in producer_names:
-        keys_to_send[producer_names[k]].append(k)
-
-    # convert producer model name to ModelShardID
-    producer_name2producer_handlers = {}
-    for producer_name in keys_to_send:
-        producer_name2producer_handlers[producer_name] = [
-            config_pkg.ModelShardID.from_parallelism_rank(
-                producer_name, model_topos[producer_name], j
-            )
-            for j in range(model_topos[producer_name].world_size())
-        ]
 
     can_do_rpc = ctrl.can_do_rpc[rpc.name]
-    request_queues = ctrl.request_queues[rpc.name]
-
-    response_coroutine_idx = 0
+    request_queue = ctrl.request_queues[rpc.name]
 
     this_rpc_consumed_seqs = 0
     while not ctrl.stop.is_set():
@@ -516,88 +757,89 @@ async def model_rpc_request_func(
 
         if rpc.interface_type == dfg.ModelInterfaceType.GENERATE:
             ctrl.data_amount.gen_configs.append(model_configs[rpc.model_name])
-            ctrl.data_amount.gen_bs.append(len(sample.seqlens))
             ctrl.data_amount.gen_len.append(
                 rpc.interface_impl.args["generation_config"]["min_new_tokens"]
             )
-            ctrl.data_amount.prompt_lens.append(sample.seqlens)
+            ctrl.data_amount.record("gen", sample.seqlens)
         elif rpc.interface_type == dfg.ModelInterfaceType.TRAIN_STEP:
             ctrl.data_amount.train_configs.append(model_configs[rpc.model_name])
-            ctrl.data_amount.train_bs.append(len(sample.seqlens))
-            ctrl.data_amount.train_seqlens.append(sample.seqlens)
+            ctrl.data_amount.record("train", sample.seqlens)
         elif rpc.interface_type == dfg.ModelInterfaceType.INFERENCE:
             ctrl.data_amount.inf_configs.append(model_configs[rpc.model_name])
-            ctrl.data_amount.inf_bs.append(len(sample.seqlens))
-            ctrl.data_amount.inf_seqlens.append(sample.seqlens)
+            ctrl.data_amount.record("inf", sample.seqlens)
 
         this_rpc_consumed_seqs += len(sample.seqlens)
 
         # logger.info(f"Model rpc {rpc.name} requesting.")
         dp_size = topo.get_dim("data")
         if rpc.balanced_dp:
+            # Equally sized DP batches must stay contiguous.
             assert len(sample.seqlens) % dp_size == 0
             min_n_seqs_per_dp = len(sample.seqlens) // dp_size
+            partitions = datapack.min_abs_diff_partition(
+                np.array(sample.seqlens, dtype=np.int32),
+                dp_size,
+                min_size=min_n_seqs_per_dp,
+            )
+            target_mapping = {
+                i: list(range(v[0], v[1])) for i, v in enumerate(partitions)
+            }
         else:
-            min_n_seqs_per_dp = 1
-        partitions = datapack.min_abs_diff_partition(
-            np.array(sample.seqlens, dtype=np.int32),
-            dp_size,
-            min_size=min_n_seqs_per_dp,
-        )
-        target_mapping = {i: list(range(v[0], v[1])) for i, v in enumerate(partitions)}
+            # Bin-pack sequences into DP ranks to minimize the maximum
+            # token load. All DP ranks synchronize at the end of the RPC,
+            # so the slowest (largest) bin determines the step time.
+            groups = datapack.ffd_partition(
+                np.array(sample.seqlens, dtype=np.int32), dp_size
+            )
+            target_mapping = dict(enumerate(groups))
 
         # Set data owner of produced data by this RPC, such that downstream RPCs can know
         # whether to fetch these data.
-        for dp_idx, (st, ed) in enumerate(partitions):
-            for i in range(st, ed):
-                for k in rpc.output_data:
-                    if k in rpc.output_key_remap:
-                        k = rpc.output_key_remap[k]
-                    data_owner[sample.indices[i], k] = (rpc.model_name, dp_idx)
+        indices_arr = np.asarray(sample.indices, dtype=np.int64)
+        for dp_idx, target_idxs in target_mapping.items():
+            for k in rpc.output_data:
+                if k in rpc.output_key_remap:
+                    k = rpc.output_key_remap[k]
+                data_owner.set_owner(
+                    k, indices_arr[target_idxs], rpc.model_name, dp_idx
+                )
 
         # Get the data owner of this RPC's input data.
         producer_mappings: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
         for k in rpc.input_data:
-            names, dp_indices = [], []
-            for buf_idx in sample.indices:
-                owner_name, dp_idx = data_owner[(buf_idx, k)]
-                names.append(owner_name)
-                dp_indices.append(dp_idx)
-            assert len(set(names)) == 1
-            producer_mapping = defaultdict(list)
-            for i, dp_idx in enumerate(dp_indices):
-                producer_mapping[dp_idx].append(i)
-            producer_mapping = {k: sorted(v) for k, v in producer_mapping.items()}
-            producer_mappings[names[0], k] = producer_mapping
+            owner_name, dp_indices = data_owner.get_owner(k, indices_arr)
+            # Group sequence positions by producer DP rank with one stable
+            # sort; within each group positions stay ascending, matching
+            # the sorted per-rank lists built by the old append loop.
+            order = np.argsort(dp_indices, kind="stable")
+            sorted_dp = dp_indices[order]
+            boundaries = np.nonzero(np.diff(sorted_dp))[0] + 1
+            producer_mapping = {
+                int(dp_indices[g[0]]): g.tolist()
+                for g in np.split(order, boundaries)
+            }
+            producer_mappings[owner_name, k] = producer_mapping
 
         # send partitioned data to model workers
         req_ids, other_req_ids = await scatter_tensor_to_mws(
             rpc=rpc,
-            stream=stream,
-            msid2mwid=msid2mwid,
-            model_topos=model_topos,
-            model_configs=model_configs,
-            producer_names=producer_names,
-            producer_name2producer_handlers=producer_name2producer_handlers,
+            demux=demux,
+            plan=scatter_plan,
             producer_mappings=producer_mappings,
             target_mapping=target_mapping,
             buffer_indices=sample.indices,
             seqlens=sample.seqlens,
-            handlers=handlers,
-        )
-        await request_queues[response_coroutine_idx].put(
-            (req_ids, other_req_ids, time.perf_counter())
         )
-        response_coroutine_idx = (response_coroutine_idx + 1) % len(request_queues)
+        request_queue.put_nowait((req_ids, other_req_ids, time.perf_counter()))
         logger.info(f"Model rpc {rpc.name} requested.")
 
 
 async def model_rpc_reply_func(
-    corountine_idx: int,
     rpc: dfg.MFCDef,
-    stream: request_reply_stream.NameResolvingRequstClient,
+    demux: ReplyDemux,
     buffer: AsyncIOSequenceBuffer,
     model_topos: Dict[str, topology.PipeModelDataParallelTopology],
+    handlers_by_model: Dict[ModelName, List[config_pkg.ModelShardID]],
     ctrl: RPCCorountineControl,
 ):
     topo = model_topos[rpc.model_name]
@@ -607,38 +849,30 @@ async def model_rpc_reply_func(
         for i in range(dp_size)
     ]
     dp_head_handlers = [
-        config_pkg.ModelShardID.from_parallelism_rank(rpc.model_name, topo, i)
-        for i in dp_head_indices
+        handlers_by_model[rpc.model_name][i] for i in dp_head_indices
     ]
 
-    request_queue = ctrl.request_queues[rpc.name][corountine_idx]
+    request_queue = ctrl.request_queues[rpc.name]
     can_do_rpc = ctrl.can_do_rpc[rpc.name]
 
     while not ctrl.stop.is_set():
         req_ids, other_req_ids, tik = await request_queue.get()
 
-        # empty requests with parameter synchronization hooks may be issued
-        await asyncio.gather(
-            *[
-                _awaitable_response(
-                    stream, pattern=create_exact_match_pattern([req_id])
-                )
-                for req_id in other_req_ids
-            ]
-        )
-
-        responses = await asyncio.gather(
-            *[
-                _awaitable_response(
-                    stream, pattern=create_exact_match_pattern([req_id])
-                )
-                for req_id in req_ids
-            ]
-        )
+        # Await the main replies first; replies of empty requests carrying
+        # parameter synchronization hooks only gate the concurrency
+        # semaphore, not the produced data, so downstream RPCs are
+        # unblocked as soon as the main fan-in completes.
+        reply_by_id: Dict[uuid.UUID, request_reply_stream.Payload] = {}
+        other_reply_coros = [demux.wait(req_id) for req_id in other_req_ids]
+        for coro in asyncio.as_completed(
+            [demux.wait(req_id) for req_id in req_ids]
+        ):
+            p = await coro
+            reply_by_id[p.request_id] = p
         # logger.info(f"rpc {rpc.name} received responses {req_ids}")
 
         responses: List[request_reply_stream.Payload] = [
-            responses[i] for i in dp_head_indices
+            reply_by_id[req_ids[i]] for i in dp_head_indices
         ]
         recv_tik = time.perf_counter()
 
@@ -658,21 +892,35 @@ async def model_rpc_reply_func(
         if rpc.log_return_value:
             logger.info(f"RPC name {rpc.name} returns {res}")
 
+        if not rpc.is_dst:
+            # Mark the produced keys ready before waiting on the hook
+            # replies: consumers of this RPC's output start requesting
+            # (and transferring data) while e.g. offload or reverse
+            # parameter reallocation is still in flight.
+            buffer_indices = list(
+                itertools.chain.from_iterable(
+                    response.data["buffer_indices"] for response in responses
+                )
+            )
+            keys = res
+            seqlens = list(
+                itertools.chain.from_iterable(
+                    response.data["seqlens"] for response in responses
+                )
+            )
+            await buffer.amend_batch(
+                buffer_indices, [(keys, seqlen) for seqlen in seqlens]
+            )
+
+        if other_reply_coros:
+            await asyncio.gather(*other_reply_coros)
+
         can_do_rpc.release()
 
         ctrl.rpc_traversal[rpc.name] += 1
 
         if rpc.is_dst:
             await ctrl.train_count.put(1)
-        else:
-            buffer_indices = sum(
-                [response.data["buffer_indices"] for response in responses], []
-            )
-            keys = res
-            seqlens = sum([response.data["seqlens"] for response in responses], [])
-            await buffer.amend_batch(
-                buffer_indices, [(keys, seqlen) for seqlen in seqlens]
-            )
 
         logger.info(
             f"Model rpc {rpc.name} finished. Run time {time.perf_counter() - tik:.4f}s."
@@ -684,8 +932,8 @@ async def load_data_func(
     src_rpc_dp_size: int,
     src_rpc_model_name: str,
     buffer: AsyncIOSequenceBuffer,
-    data_owner: Dict[Tuple[int, str], Tuple[str, int]],
-    stream: request_reply_stream.NameResolvingRequstClient,
+    data_owner: DataOwnerTable,
+    demux: ReplyDemux,
     ctrl: RPCCorountineControl,
 ):
     while not ctrl.stop.is_set():
@@ -699,7 +947,7 @@ async def load_data_func(
         is_final_batch = False
         while not is_final_batch:
             data_batches: List[data_api.DataBatchMeta] = await group_rpc_blocked(
-                stream,
+                demux,
                 handlers=[f"__data{i}__" for i in range(src_rpc_dp_size)],
                 handle_type="fetch",
                 datas=[None for _ in range(src_rpc_dp_size)],
@@ -717,20 +965,19 @@ async def load_data_func(
         for x in loaded_data_batches:
             all_data += data_api.unpack_data_batch(x)
 
+        assert all(len(x.seqlens) == 1 for x in all_data)
+        seqlens = np.array([x.seqlens[0] for x in all_data], dtype=np.int32)
+        dp_ranks = np.array([x.dp_rank for x in all_data], dtype=np.int32)
+
         steps_per_epoch = len(all_data) // src_rpc.max_n_seqs
-        avg_tokens_per_batch = sum(x.seqlens[0] for x in all_data) / steps_per_epoch
+        avg_tokens_per_batch = seqlens.sum() / steps_per_epoch
         logger.info(
             f"Training epoch {cur_epoch + 1} approximately has {steps_per_epoch} steps. "
             f"Each batch has {avg_tokens_per_batch:.2f} tokens in average."
         )
         await ctrl.data_spec_queue.put((steps_per_epoch, avg_tokens_per_batch))
 
-        dp_data_batches = [0 for _ in range(src_rpc_dp_size)]
-        for x in all_data:
-            dp_data_batches[x.dp_rank] += 1
-
-        assert all(len(x.seqlens) == 1 for x in all_data)
-        seqlens = np.array([x.seqlens[0] for x in all_data], dtype=np.int32)
+        dp_data_batches = np.bincount(dp_ranks, minlength=src_rpc_dp_size)
 
         # NOTE: The reordered indices prioritize longer sequences for detecting OOM errors early.
         reorder_indices, _ = datapack.reorder_to_balanced_batches(
@@ -751,22 +998,27 @@ async def load_data_func(
         buffer_indices = await buffer.put_batch(batch)
 
         all_data = [all_data[i] for i in recover_indices]
-        buffer_indices = [buffer_indices[i] for i in recover_indices]
-        assert len(buffer_indices) == len(all_data)
+        buf_idx_arr = np.asarray(buffer_indices, dtype=np.int64)[recover_indices]
+        assert len(buf_idx_arr) == len(all_data)
 
+        # The recovered order is the original dataloader order, so the
+        # dp_ranks array computed above still aligns with buf_idx_arr.
         for k in keys:
-            for buf_idx, x in zip(buffer_indices, all_data):
-                data_owner[(buf_idx, k)] = (src_rpc_model_name, x.dp_rank)
-
-        store_buffer_indices = [[] for _ in range(src_rpc_dp_size)]
-        for buf_idx, x in zip(buffer_indices, all_data):
-            store_buffer_indices[x.dp_rank].append(buf_idx)
+            data_owner.set_owner(k, buf_idx_arr, src_rpc_model_name, dp_ranks)
+
+        # Group buffer indices by DP rank with one stable sort instead of
+        # a Python-level append per sequence.
+        order = np.argsort(dp_ranks, kind="stable")
+        splits = np.searchsorted(dp_ranks[order], np.arange(1, src_rpc_dp_size))
+        store_buffer_indices = [
+            buf_idx_arr[g].tolist() for g in np.split(order, splits)
+        ]
 
         for x, y in zip(store_buffer_indices, dp_data_batches):
             assert len(x) == y, (len(x), y)
 
         await group_rpc_blocked(
-            stream,
+            demux,
             handlers=[f"__data{i}__" for i in range(src_rpc_dp_size)],
             handle_type="store",
             datas=store_buffer_indices,
@@ -781,6 +1033,57 @@ async def load_data_func(
         )
 
 
+def _llama_flops(da: InterfaceDataAmount) -> float:
+    """Closed-form LLaMA FLOPs of one step from the SoA accounting arrays.
+
+    Mirrors ``calculate_llama_train_flops``, ``caculuate_llama_forward_flops``,
+    and ``calculate_llama_gen_flops`` in ``realhf.base.monitor``, vectorized
+    over all recorded micro-batches. The generation decode loop is summed
+    analytically over the ``gen_len`` steps.
+    """
+
+    def _config_arrays(configs: List[ReaLModelConfig]):
+        return (
+            np.array([c.n_layers for c in configs], dtype=np.float64),
+            np.array([c.hidden_dim for c in configs], dtype=np.float64),
+            np.array([c.intermediate_dim for c in configs], dtype=np.float64),
+            np.array([c.vocab_size for c in configs], dtype=np.float64),
+        )
+
+    def _forward(S, Q, L, h, m, v):
+        # S: total tokens, Q: sum of squared seqlens per micro-batch.
+        return 2 * L * (4 * S * h**2 + 2 * Q * h + 3 * S * h * m) + 4 * S * v * h
+
+    flops = 0.0
+    if da.train_bs:
+        L, h, m, v = _config_arrays(da.train_configs)
+        S = np.array(da.train_tokens, dtype=np.float64)
+        Q = np.array(da.train_sq_tokens, dtype=np.float64)
+        # Checkpoint activations factor of 4.
+        flops += float((4 * _forward(S, Q, L, h, m, v)).sum())
+    if da.inf_bs:
+        L, h, m, v = _config_arrays(da.inf_configs)
+        S = np.array(da.inf_tokens, dtype=np.float64)
+        Q = np.array(da.inf_sq_tokens, dtype=np.float64)
+        flops += float(_forward(S, Q, L, h, m, v).sum())
+    if da.gen_bs:
+        L, h, m, v = _config_arrays(da.gen_configs)
+        P = np.array(da.prompt_tokens, dtype=np.float64)
+        Q = np.array(da.prompt_sq_tokens, dtype=np.float64)
+        b = np.array(da.gen_bs, dtype=np.float64)
+        g = np.array(da.gen_len, dtype=np.float64)
+        prefill = _forward(P, Q, L, h, m, v)
+        # Decode step i attends over a prefix of P + b * (i + 1) tokens;
+        # summing that over i = 0..g-1 gives the context term below.
+        ctx = g * P + b * g * (g + 1) / 2
+        decode = (
+            2 * L * (4 * b * h**2 * g + 2 * h * ctx + 3 * b * h * m * g)
+            + 4 * b * v * h * g
+        )
+        flops += float((prefill + decode).sum())
+    return flops
+
+
 def _gather_stat(src: List[Dict]) -> Dict:
     cnt, stats = {}, {}
     for reply in src:
@@ -800,7 +1103,7 @@ def _gather_stat(src: List[Dict]) -> Dict:
 
 
 async def model_eval_thread_func(
-    stream: request_reply_stream.NameResolvingRequstClient,
+    demux: ReplyDemux,
     handlers: List[config_pkg.ModelShardID],
     eval_queue: asyncio.Queue,
     stop_ctl: asyncio.Event,
@@ -808,7 +1111,7 @@ async def model_eval_thread_func(
     while not stop_ctl.is_set():
         epoch, epoch_step = await eval_queue.get()
         eval_stats = await group_rpc_blocked(
-            stream, handlers, "evaluate", [None for _ in handlers]
+            demux, handlers, "evaluate", [None for _ in handlers]
         )
         eval_stats = _gather_stat(list(filter(lambda x: bool(x), eval_stats)))
         logger.info(
@@ -817,7 +1120,7 @@ async def model_eval_thread_func(
 
 
 async def model_save_thread_func(
-    stream: request_reply_stream.NameResolvingRequstClient,
+    demux: ReplyDemux,
     handlers: List[config_pkg.ModelShardID],
     model_save_root: str,
     save_queue: asyncio.Queue,
@@ -833,7 +1136,7 @@ async def model_save_thread_func(
             )
             for s in handlers
         ]
-        await group_rpc_blocked(stream, handlers, "save", model_save_dirs)
+        await group_rpc_blocked(demux, handlers, "save", model_save_dirs)
         logger.info(f"Save models at epoch {epoch} step {epoch_step}.")
 
 
@@ -861,15 +1164,63 @@ class MasterWorker(worker_base.Worker):
                 rpc.min_n_seqs_per_dp = 1
                 rpc.min_n_seqs = _dp_size * _pp_size
 
-        self.__mwid2msids = defaultdict(list)
-        for msid, mwid in self.config.msid2mwid.items():
-            self.__mwid2msids[mwid].append(msid)
+        # Group shard ids by worker in C (sorted+groupby) instead of
+        # looping over the whole msid2mwid mapping in Python.
+        self.__mwid2msids = {
+            mwid: [msid for msid, _ in group]
+            for mwid, group in itertools.groupby(
+                sorted(self.config.msid2mwid.items(), key=itemgetter(1)),
+                key=itemgetter(1),
+            )
+        }
+
+        # Handler lists are pure functions of (model_name, topo); build them
+        # once instead of reconstructing shard ids on every RPC step.
+        self.__handlers_by_model: Dict[ModelName, List[config_pkg.ModelShardID]] = {
+            model_name: [
+                config_pkg.ModelShardID.from_parallelism_rank(model_name, topo, j)
+                for j in range(topo.world_size())
+            ]
+            for model_name, topo in self.__model_topos.items()
+        }
 
         self.__rpc_srcs = list(filter(lambda rpc: rpc.is_src, self.__model_rpcs))
         self.__rpc_dsts = list(filter(lambda rpc: rpc.is_dst, self.__model_rpcs))
         self.__n_rpc_srcs = len(self.__rpc_srcs)
         self.__n_rpc_dsts = len(self.__rpc_dsts)
 
+        # Kahn-style topological layering of the dataflow graph, derived
+        # once here. Scheduling itself stays event-driven -- every RPC
+        # fires as soon as its input keys land in the sequence buffer, so
+        # sibling RPCs within a layer already run concurrently and
+        # consecutive steps overlap across layers -- but the layering
+        # validates acyclicity up front and documents the execution
+        # structure in the logs.
+        _remaining = {rpc.name: len(rpc.parents) for rpc in self.__model_rpcs}
+        self.__rpc_layers: List[List[dfg.MFCDef]] = []
+        _frontier = [r for r in self.__model_rpcs if _remaining[r.name] == 0]
+        while _frontier:
+            self.__rpc_layers.append(_frontier)
+            _next_frontier = []
+            for r in _frontier:
+                for c in r.children_rpcs:
+                    _remaining[c.name] -= 1
+                    if _remaining[c.name] == 0:
+                        _next_frontier.append(c)
+            _frontier = _next_frontier
+        if sum(len(l) for l in self.__rpc_layers) != len(self.__model_rpcs):
+            raise ValueError(
+                "The dataflow graph contains a cycle: "
+                f"{[rpc.name for rpc in self.__model_rpcs]}."
+            )
+        logger.info(
+            "Dataflow graph layers: "
+            + " -> ".join(
+                "{" + ", ".join(r.name for r in layer) + "}"
+                for layer in self.__rpc_layers
+            )
+        )
+
         # Save and eval control.
         self.__total_train_epochs = config.exp_ctrl.total_train_epochs
         self.__save_ctl = timeutil.EpochStepTimeFreqCtl(
@@ -918,27 +1269,36 @@ class MasterWorker(worker_base.Worker):
         self.__last_step_info = None
 
         # for benchmark
-        self.e2e_time_history = []
-        self.level_time_history = defaultdict(list)
+        # Step times are stored as integer nanoseconds in a preallocated
+        # array rather than an ever-growing list of Python floats.
         self.__benchmark_steps = config.exp_ctrl.benchmark_steps
+        self.e2e_time_history = np.zeros(
+            self.__benchmark_steps or (1 << 16), dtype=np.int64
+        )
+        self.__n_recorded_steps = 0
+
+        # Pre-warm the numba-jitted partition routine so that JIT
+        # compilation happens here instead of on the first RPC step.
+        datapack.min_abs_diff_partition(np.ones(4, dtype=np.int32), 2)
 
         return config.worker_info
 
     def __lazy_init(self):
-        # Set up streams.
-        handler_routing = copy.deepcopy(self.config.msid2mwid)
+        # Set up streams. Only the top-level dict is mutated below (new
+        # string keys for data workers), so a shallow copy suffices.
+        handler_routing = dict(self.config.msid2mwid)
         src_rpc = self.__rpc_srcs[0]
         src_rpc_topo = self.config.model_topos[src_rpc.model_name]
         src_rpc_dp_size = src_rpc_topo.get_dim("data")
         src_rpc_pp_size = src_rpc_topo.get_dim("pipe")
+        # Each data-fetch role is served by the worker that already hosts
+        # the corresponding dp rank of the source RPC (last pipeline
+        # stage), so loaded samples start out co-located with their first
+        # consumer and the subsequent NCCL transfer is local.
         for i in range(src_rpc_dp_size):
             rank = src_rpc_topo.get_rank(data=i, pipe=src_rpc_pp_size - 1, model=0)
             handler_routing[f"__data{i}__"] = self.config.msid2mwid[
-                config_pkg.ModelShardID.from_parallelism_rank(
-                    model_name=src_rpc.model_name,
-                    topo=src_rpc_topo,
-                    parallelism_rank=rank,
-                )
+                self.__handlers_by_model[src_rpc.model_name][rank]
             ]
         self.__stream = request_reply_stream.make_master_stream(
             self.config.worker_info,
@@ -947,75 +1307,71 @@ class MasterWorker(worker_base.Worker):
         )
         self.__stream: request_reply_stream.NameResolvingRequstClient
 
-        src_rpc = [rpc for rpc in self.config.model_rpcs if rpc.is_src][0]
         src_rpc_model_name = src_rpc.model_name
-        src_rpc_dp_size = self.config.model_topos[src_rpc.model_name].get_dim("data")
 
-        # Request training specification from data workers.
-        total_n_seqs = 0
-        for i in range(src_rpc_dp_size):
-            p = request_reply_stream.Payload(
+        # Request training specifications from data workers and model
+        # configs from model workers in one batched round trip instead of
+        # three sequential round trips per handler. These fetches are
+        # read-only, so they skip the syn-ack handshake entirely and the
+        # whole exchange costs a single round trip.
+        n_spec_requests = src_rpc_dp_size
+        metadata_payloads = [
+            request_reply_stream.Payload(
                 handler=f"__data{i}__",
                 handle_name="spec",
+                no_syn=True,
             )
-            self.__stream.post(p)
-            self.__stream.poll(
-                block=True, pattern=create_exact_match_pattern([p.syn_reply_id])
+            for i in range(src_rpc_dp_size)
+        ] + [
+            request_reply_stream.Payload(
+                handler=self.__handlers_by_model[model_name][0],
+                handle_name="model_config",
+                no_syn=True,
             )
-            self.__stream.post(
-                request_reply_stream.Payload(
-                    handler=f"__data{i}__",
-                    handle_name="ack",
-                    request_id=p.ack_reply_id,
-                )
+            for model_name in self.config.model_topos
+        ]
+        self.__stream.post_many(metadata_payloads)
+        metadata_replies = [
+            self.__stream.poll(block=True, match_id=p.request_id)
+            for p in metadata_payloads
+        ]
+        total_n_seqs = sum(r.data for r in metadata_replies[:n_spec_requests])
+        # The reply is None if the model is not a ReaLModel.
+        self.__model_configs: Dict[ModelName, None | ReaLModelConfig] = {
+            model_name: r.data
+            for model_name, r in zip(
+                self.config.model_topos, metadata_replies[n_spec_requests:]
             )
-            n_seqs_per_dataset_shard: int = self.__stream.poll(
-                block=True, pattern=create_exact_match_pattern([p.request_id])
-            ).data
-            total_n_seqs += n_seqs_per_dataset_shard
+        }
 
-        event_loop = asyncio.new_event_loop()
+        # The loop is driven entirely through public APIs
+        # (run_until_complete, add_reader, tasks), so uvloop's C loop is a
+        # drop-in replacement; it cuts per-task and fd-wakeup overhead,
+        # which matters with hundreds of concurrent request/reply
+        # coroutines. Fall back to the stock loop when it is absent.
+        if uvloop is not None:
+            event_loop = uvloop.new_event_loop()
+        else:
+            event_loop = asyncio.new_event_loop()
         asyncio.set_event_loop(event_loop)
 
+        # Start the reply dispatcher before any coroutine awaits replies.
+        # Model initialization below already runs async group RPCs.
+        self.__reply_demux = ReplyDemux(self.__stream)
+        demux_task = event_loop.create_task(self.__reply_demux.run())
+
         # Build some data required for subsequent model function calls.
         self.__all_model_handlers: List[config_pkg.ModelShardID] = []
         self.__dp0_model_handlers: List[config_pkg.ModelShardID] = []
         for model_name, topo in self.config.model_topos.items():
-            num_dp = topo.get_dim("data")
-            self.__all_model_handlers += [
-                config_pkg.ModelShardID.from_parallelism_rank(model_name, topo, j)
-                for j in range(topo.world_size())
-            ]
+            # __handlers_by_model is indexed by parallelism rank, so
+            # filtered ranks can be resolved without another mesh walk.
+            self.__all_model_handlers += self.__handlers_by_model[model_name]
             self.__dp0_model_handlers += [
-                config_pkg.ModelShardID.from_parallelism_rank(model_name, topo, j)
+                self.__handlers_by_model[model_name][j]
                 for j in topo.filter_match(data=0)
             ]
 
-        # Request model configs from model workers.
-        # Return None if the model is not a ReaLModel.
-        self.__model_configs: Dict[ModelName, None | ReaLModelConfig] = {}
-        for model_name in self.config.model_topos:
-            p = request_reply_stream.Payload(
-                handler=config_pkg.ModelShardID.from_parallelism_rank(
-                    model_name, topo, 0
-                ),
-                handle_name="model_config",
-            )
-            self.__stream.post(p)
-            self.__stream.poll(
-                block=True, pattern=create_exact_match_pattern([p.syn_reply_id])
-            )
-            self.__stream.post(
-                request_reply_stream.Payload(
-                    handler=p.handler,
-                    handle_name="ack",
-                    request_id=p.ack_reply_id,
-                )
-            )
-            self.__model_configs[model_name] = self.__stream.poll(
-                pattern=create_exact_match_pattern([p.request_id]), block=True
-            ).data
-
         # Initialize model backends.
         # For models with the same role, they share the same model parameters.
         # Therefore, we must call reallocate parameters from A to B
@@ -1070,14 +1426,9 @@ class MasterWorker(worker_base.Worker):
         self.logger.info(
             f"Initialize model backends with order: {_reordered_model_names}."
         )
-        _initialized_roles = []
-        for model_name in _reordered_model_names:
-            topo = self.config.model_topos[model_name]
+
+        def _make_ft_spec(model_name: ModelName) -> model_api.FinetuneSpec:
             # Build FinetuneSpec, which is required to initialize backends.
-            _handlers = [
-                config_pkg.ModelShardID.from_parallelism_rank(model_name, topo, j)
-                for j in range(topo.world_size())
-            ]
             train_rpcs = list(
                 filter(
                     lambda rpc: rpc.model_name == model_name
@@ -1092,58 +1443,79 @@ class MasterWorker(worker_base.Worker):
                     + train_rpcs[0].max_n_seqs
                     - 1
                 ) // train_rpcs[0].max_n_seqs
-                ft_spec = model_api.FinetuneSpec(
+                return model_api.FinetuneSpec(
                     total_train_epochs=self.config.exp_ctrl.total_train_epochs,
                     total_train_steps=steps_per_epoch
                     * self.config.exp_ctrl.total_train_epochs,
                     steps_per_epoch=steps_per_epoch,
                 )
-            else:
-                ft_spec = model_api.FinetuneSpec(
-                    total_train_epochs=self.config.exp_ctrl.total_train_epochs,
-                    total_train_steps=-1,
-                    steps_per_epoch=-1,
-                )
-            model_ft_specs = [ft_spec] * topo.world_size()
-
-            # Reallocate parameters if necessary.
-            if model_name.role in _initialized_roles:
-                assert model_name in _param_recevers
-                _param_realloc_src = _param_senders[_param_recevers.index(model_name)]
-                _request_parameter_sync(
-                    stream=self.__stream,
-                    msid2mwid=self.config.msid2mwid,
-                    from_model_name=_param_realloc_src,
-                    to_model_name=model_name,
-                    from_topo=self.config.model_topos[_param_realloc_src],
-                    to_topo=self.config.model_topos[model_name],
-                    to_model_config=self.__model_configs[model_name],
-                )
+            return model_api.FinetuneSpec(
+                total_train_epochs=self.config.exp_ctrl.total_train_epochs,
+                total_train_steps=-1,
+                steps_per_epoch=-1,
+            )
 
-            _task = event_loop.create_task(
-                group_rpc_blocked(
-                    self.__stream,
-                    handlers=_handlers,
+        async def _initialize_role_models(model_names: List[ModelName]):
+            # Replicas of one role share parameters held by the first
+            # (trainable) replica, so sync/initialize of the same role
+            # must stay serial within this coroutine.
+            for role_initialized, model_name in enumerate(model_names):
+                topo = self.config.model_topos[model_name]
+                model_ft_specs = [_make_ft_spec(model_name)] * topo.world_size()
+
+                # Reallocate parameters if necessary.
+                if role_initialized:
+                    assert model_name in _param_recevers
+                    _param_realloc_src = _param_senders[
+                        _param_recevers.index(model_name)
+                    ]
+                    await _request_parameter_sync(
+                        demux=self.__reply_demux,
+                        msid2mwid=self.config.msid2mwid,
+                        from_model_name=_param_realloc_src,
+                        to_model_name=model_name,
+                        from_handlers=self.__handlers_by_model[_param_realloc_src],
+                        to_handlers=self.__handlers_by_model[model_name],
+                        from_topo=self.config.model_topos[_param_realloc_src],
+                        to_topo=self.config.model_topos[model_name],
+                        to_model_config=self.__model_configs[model_name],
+                    )
+
+                await group_rpc_blocked(
+                    self.__reply_demux,
+                    handlers=self.__handlers_by_model[model_name],
                     handle_type="initialize",
                     datas=model_ft_specs,
                 )
-            )
-            event_loop.run_until_complete(asyncio.gather(_task))[0]
-
-            # Reallocate parameters back.
-            if model_name.role in _initialized_roles:
-                # Reversely sync parameters
-                _request_parameter_sync(
-                    stream=self.__stream,
-                    msid2mwid=self.config.msid2mwid,
-                    from_model_name=model_name,
-                    to_model_name=_param_realloc_src,
-                    to_topo=self.config.model_topos[_param_realloc_src],
-                    from_topo=self.config.model_topos[model_name],
-                    to_model_config=self.__model_configs[_param_realloc_src],
-                )
 
-            _initialized_roles.append(model_name.role)
+                # Reallocate parameters back.
+                if role_initialized:
+                    # Reversely sync parameters
+                    await _request_parameter_sync(
+                        demux=self.__reply_demux,
+                        msid2mwid=self.config.msid2mwid,
+                        from_model_name=model_name,
+                        to_model_name=_param_realloc_src,
+                        from_handlers=self.__handlers_by_model[model_name],
+                        to_handlers=self.__handlers_by_model[_param_realloc_src],
+                        to_topo=self.config.model_topos[_param_realloc_src],
+                        from_topo=self.config.model_topos[model_name],
+                        to_model_config=self.__model_configs[_param_realloc_src],
+                    )
+
+        # Different roles share no parameters, so their initialization
+        # (including the on-device parameter sync) overlaps freely.
+        _names_by_role = defaultdict(list)
+        for model_name in _reordered_model_names:
+            _names_by_role[model_name.role].append(model_name)
+        event_loop.run_until_complete(
+            asyncio.gather(
+                *[
+                    _initialize_role_models(model_names)
+                    for model_names in _names_by_role.values()
+                ]
+            )
+        )
 
         logger.info("Initializations of models and backends complete.")
 
@@ -1160,10 +1532,7 @@ class MasterWorker(worker_base.Worker):
                 rpc.name: asyncio.Semaphore(rpc.max_concurrent_calls)
                 for rpc in self.__model_rpcs
             },
-            request_queues={
-                rpc.name: [asyncio.Queue(1) for _ in range(rpc.max_concurrent_calls)]
-                for rpc in self.__model_rpcs
-            },
+            request_queues={rpc.name: LiteQueue() for rpc in self.__model_rpcs},
             is_recover_epoch=self.__recover_run,
             used_hash_vals_this_epoch=(
                 self.__recover_info.hash_vals_to_ignore if self.__recover_run else set()
@@ -1177,30 +1546,46 @@ class MasterWorker(worker_base.Worker):
 
         # NOTE: We don't set a configurable maximum buffer size here because we want to keep all data in the buffer.
         # We assume that the dataset size is at most 1M. We have warnings if the buffer is 95% full.
+        buffer_max_size = int(1e6)
         self.__seqbuffer = AsyncIOSequenceBuffer(
             self.__model_rpcs,
-            max_size=int(1e6),
+            max_size=buffer_max_size,
             fetch_ctl=self.__rpc_ctrl.fetch_data_queue,
             fetch_master_ctl=self.__fetch_master_ctl,
         )
 
-        self.__data_owner: Dict[Tuple[int, str], Tuple[str, int]] = {}
+        self.__data_owner = DataOwnerTable(capacity=buffer_max_size)
 
         logger.info(f"Creating asyncio coroutines...")
 
+        # The scatter of each RPC (handler set, handle names, and hook
+        # attachments) depends only on the dataflow graph, topologies, and
+        # model configs, all static by now. Materialize a plan per RPC once
+        # instead of re-deriving it on every step.
+        self.__scatter_plans: Dict[str, RPCScatterPlan] = {
+            rpc.name: make_scatter_plan(
+                rpc,
+                src_rpc_model_name=src_rpc_model_name,
+                msid2mwid=self.config.msid2mwid,
+                model_configs=self.__model_configs,
+                model_topos=self.__model_topos,
+                handlers_by_model=self.__handlers_by_model,
+            )
+            for rpc in self.__model_rpcs
+        }
+
         # Create coroutines for model RPCs.
         coroutine_tasks = []
         for rpc in self.__model_rpcs:
             request_task = event_loop.create_task(
                 model_rpc_request_func(
                     rpc=rpc,
-                    msid2mwid=self.config.msid2mwid,
-                    src_rpc_model_name=src_rpc_model_name,
                     data_owner=self.__data_owner,
-                    stream=self.__stream,
+                    demux=self.__reply_demux,
                     buffer=self.__seqbuffer,
                     model_topos=self.__model_topos,
                     model_configs=self.__model_configs,
+                    scatter_plan=self.__scatter_plans[rpc.name],
                     ctrl=self.__rpc_ctrl,
                 )
             )
@@ -1208,11 +1593,11 @@ class MasterWorker(worker_base.Worker):
             for j in range(rpc.max_concurrent_calls):
                 _reply_task = event_loop.create_task(
                     model_rpc_reply_func(
-                        corountine_idx=j,
                         rpc=rpc,
-                        stream=self.__stream,
+                        demux=self.__reply_demux,
                         buffer=self.__seqbuffer,
                         model_topos=self.__model_topos,
+                        handlers_by_model=self.__handlers_by_model,
                         ctrl=self.__rpc_ctrl,
                     )
                 )
@@ -1227,13 +1612,13 @@ class MasterWorker(worker_base.Worker):
                 src_rpc_model_name=src_rpc_model_name,
                 data_owner=self.__data_owner,
                 buffer=self.__seqbuffer,
-                stream=self.__stream,
+                demux=self.__reply_demux,
                 ctrl=self.__rpc_ctrl,
             )
         )
         eval_task = event_loop.create_task(
             model_eval_thread_func(
-                stream=self.__stream,
+                demux=self.__reply_demux,
                 handlers=self.__all_model_handlers,
                 eval_queue=self.__rpc_ctrl.eval_queue,
                 stop_ctl=self.__rpc_ctrl.stop,
@@ -1241,27 +1626,34 @@ class MasterWorker(worker_base.Worker):
         )
         save_task = event_loop.create_task(
             model_save_thread_func(
-                stream=self.__stream,
+                demux=self.__reply_demux,
                 handlers=self.__all_model_handlers,
                 model_save_root=self.MODEL_SAVE_ROOT,
                 save_queue=self.__rpc_ctrl.save_queue,
                 stop_ctl=self.__rpc_ctrl.stop,
             )
         )
-        coroutine_tasks += [load_data_task, eval_task, save_task]
+        coroutine_tasks += [load_data_task, eval_task, save_task, demux_task]
 
-        # Set up a run context of EventLoop.run_util_complete, baiscally copy-paste from cpython.
-        # With this context, we can call the non-block EventLoop._run_once (similar to worker._poll).
-        self.__asyncio_ctx = setup_run_until_complete(
-            event_loop, asyncio.gather(*coroutine_tasks)
-        )
+        self.__event_loop = event_loop
+        # The gathered future surfaces the first exception raised in any
+        # coroutine; _poll re-raises it whenever the loop yields control.
+        self.__main_future = asyncio.gather(*coroutine_tasks)
 
         logger.info(f"Coroutines created. The master worker is ready to run.")
 
+        # Everything long-lived (topologies, handlers, scatter plans, and
+        # the coroutine set) now exists. Freeze it out of the garbage
+        # collector and raise the gen0 threshold so steady-state collections
+        # triggered by per-step payload churn do not stall the event loop.
+        gc.collect()
+        gc.freeze()
+        gc.set_threshold(50_000, 50, 50)
+
         self.__initialized = True
         self._train_start_time = time.perf_counter()
 
-        self.__clear_data_cache_reqids = None
+        self.__clear_data_cache_task = None
 
         self.__cur_steps_per_epoch = None
         self.__cur_avg_tokens_per_batch = None
@@ -1272,32 +1664,32 @@ class MasterWorker(worker_base.Worker):
 
         # Main execution steps. The graph runs under-the-hood in RPC & stream threads.
         # Wait for the finish of the traversal of the execution graph.
-        execution_start = time.perf_counter()
+        execution_start_ns = time.monotonic_ns()
         logger.info("Master worker is waiting for the finish of the execution graph.")
-        _rpc_dst_cnt = 0
-        while _rpc_dst_cnt < self.__n_rpc_dsts:
-            try:
-                self.__rpc_ctrl.train_count.get_nowait()
-                _rpc_dst_cnt += 1
-                continue
-            except asyncio.QueueEmpty:
-                pass
-            try:
-                # Similar to worker._poll. Run multiple times until a train step is finished.
-                self.__asyncio_ctx.loop._run_once()
-                # NOTE: The following line will propagate errors in corountines back to the main thread.
-                # It raises asyncio.exceptions.InvalidStateError if the result is not ready.
-                # (In our use cases, the result will never be ready because corountines run while-loops.)
-                # We just ignore this error and continue running.
-                self.__asyncio_ctx.future.result()
-            except asyncio.exceptions.InvalidStateError:
-                # Catch the exception when future.result() is not ready.
-                pass
-            except KeyboardInterrupt as e:
-                raise_asyncio_exception(self.__asyncio_ctx, raise_error=False)
-                raise e
-            except:
-                raise_asyncio_exception(self.__asyncio_ctx)
+
+        async def _wait_train_counts():
+            for _ in range(self.__n_rpc_dsts):
+                await self.__rpc_ctrl.train_count.get()
+
+        # Run the loop until one train step finishes. Unlike stepping the
+        # loop manually, this lets the selector block on real I/O instead
+        # of spinning. Waiting on the gathered coroutine future as well
+        # wakes us up to re-raise the first coroutine exception, which
+        # would otherwise deadlock the sentinel.
+        sentinel = self.__event_loop.create_task(_wait_train_counts())
+        try:
+            self.__event_loop.run_until_complete(
+                asyncio.wait(
+                    [sentinel, self.__main_future],
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            )
+            if self.__main_future.done():
+                sentinel.cancel()
+                self.__main_future.result()
+        except KeyboardInterrupt:
+            sentinel.cancel()
+            raise
         logger.info("Execution finished!")
 
         try:
@@ -1349,8 +1741,16 @@ class MasterWorker(worker_base.Worker):
 
         total_time_consumption = time.perf_counter() - self._train_start_time
         time_per_step = total_time_consumption / (self._global_step + 1)
-        e2e_time = time.perf_counter() - execution_start
-        self.e2e_time_history.append(e2e_time)
+        e2e_ns = time.monotonic_ns() - execution_start_ns
+        e2e_time = e2e_ns / 1e9
+        if self.__n_recorded_steps == len(self.e2e_time_history):
+            # Long non-benchmark runs outgrow the preallocated window;
+            # double it, which amortizes to O(1) per step.
+            self.e2e_time_history = np.concatenate(
+                [self.e2e_time_history, np.zeros_like(self.e2e_time_history)]
+            )
+        self.e2e_time_history[self.__n_recorded_steps] = e2e_ns
+        self.__n_recorded_steps += 1
 
         # calculate flops
         #########################################
@@ -1362,49 +1762,7 @@ class MasterWorker(worker_base.Worker):
             )
             flops = None
         else:
-            flops = 0
-            for train_bs, train_seqlens, real_config in zip(
-                self.__rpc_ctrl.data_amount.train_bs,
-                self.__rpc_ctrl.data_amount.train_seqlens,
-                self.__rpc_ctrl.data_amount.train_configs,
-            ):
-                flops += calculate_llama_train_flops(
-                    checkpoint_activations_factor=4,
-                    batch_size=train_bs,
-                    seqlens=train_seqlens,
-                    num_layers=real_config.n_layers,
-                    hidden_size=real_config.hidden_dim,
-                    intermediate_size=real_config.intermediate_dim,
-                    vocab_size=real_config.vocab_size,
-                )
-            for inf_bs, inf_seqlens, real_config in zip(
-                self.__rpc_ctrl.data_amount.inf_bs,
-                self.__rpc_ctrl.data_amount.inf_seqlens,
-                self.__rpc_ctrl.data_amount.inf_configs,
-            ):
-                flops += caculuate_llama_forward_flops(
-                    batch_size=inf_bs,
-                    seqlens=inf_seqlens,
-                    num_layers=real_config.n_layers,
-                    hidden_size=real_config.hidden_dim,
-                    intermediate_size=real_config.intermediate_dim,
-                    vocab_size=real_config.vocab_size,
-                )
-            for gen_bs, prompt_lens, gen_len, real_config in zip(
-                self.__rpc_ctrl.data_amount.gen_bs,
-                self.__rpc_ctrl.data_amount.prompt_lens,
-                self.__rpc_ctrl.data_amount.gen_len,
-                self.__rpc_ctrl.data_amount.gen_configs,
-            ):
-                flops += calculate_llama_gen_flops(
-                    batch_size=gen_bs,
-                    prompt_lens=prompt_lens,
-                    gen_len=gen_len,
-                    num_layers=real_config.n_layers,
-                    hidden_size=real_config.hidden_dim,
-                    intermediate_size=real_config.intermediate_dim,
-                    vocab_size=real_config.vocab_size,
-                )
+            flops = _llama_flops(self.__rpc_ctrl.data_amount)
             tflops = flops / (e2e_time * (10**12))
             tflops_per_gpu = flops / (e2e_time * self.config.n_model_workers * (10**12))
         self.__rpc_ctrl.data_amount.clear()
@@ -1421,10 +1779,12 @@ class MasterWorker(worker_base.Worker):
             s += f"Average #tokens per batch is {self.__cur_avg_tokens_per_batch:.0f}. "
         s += f"#End to end# execution time: *{e2e_time:.3f}*s. "
         s += f"Total time consumption: {total_time_consumption:.3f}s. "
-        if self.__cur_steps_per_epoch is not None and len(self.e2e_time_history) > 2:
+        if self.__cur_steps_per_epoch is not None and self.__n_recorded_steps > 2:
             remaining_steps = self.__cur_steps_per_epoch - self._epoch_step
             remaining_epochs = self.__total_train_epochs - self._epoch
-            avg_t = np.mean(self.e2e_time_history[2:])
+            avg_t = (
+                np.mean(self.e2e_time_history[2 : self.__n_recorded_steps]) / 1e9
+            )
             remain_t = avg_t * remaining_steps
             remain_t += avg_t * self.__cur_steps_per_epoch * remaining_epochs
             s += f"Estimated remaining time: {remain_t:.3f}s. "
@@ -1439,28 +1799,41 @@ class MasterWorker(worker_base.Worker):
             logger.info(
                 f"Finished benchmark {self.__benchmark_steps}. Total time consumption {total_time_consumption:.3f}"
             )
-            logger.info(f"avg #e2e# time *{np.mean(self.e2e_time_history):.3f}*")
-            for i, level_time_history in self.level_time_history.items():
-                logger.info(
-                    f"avg #level{i+1}# time *{np.mean(level_time_history):.3f}*"
-                )
+            avg_e2e = (
+                np.mean(self.e2e_time_history[: self.__n_recorded_steps]) / 1e9
+            )
+            logger.info(f"avg #e2e# time *{avg_e2e:.3f}*")
             self.experiment_complete_exit(f"Benchmark completes! Yeah!!!")
 
-        if self.__clear_data_cache_reqids is not None:
-            [
-                self.__stream.poll(
-                    block=True, pattern=create_exact_match_pattern([reqid])
-                )
-                for reqid in self.__clear_data_cache_reqids
-            ]
-        self.__clear_data_cache_reqids = request_all(
-            self.__stream,
-            [vs[0] for vs in self.__mwid2msids.values()],
-            "clear_data_cache",
-            [
-                self.__rpc_ctrl.training_buffer_indices
-                for _ in self.__all_model_handlers
-            ],
+        # Fire-and-forget the cache clearing: the handshakes and replies
+        # are driven by the event loop while the next step runs, instead
+        # of blocking the master at the start of the next poll. The
+        # previous task has normally finished by now; await it if not so
+        # that at most one clearing round is in flight.
+        if (
+            self.__clear_data_cache_task is not None
+            and not self.__clear_data_cache_task.done()
+        ):
+            self.__event_loop.run_until_complete(self.__clear_data_cache_task)
+        clear_handlers = [vs[0] for vs in self.__mwid2msids.values()]
+        # Snapshot and serialize the indices once; every worker receives
+        # the same pre-pickled bytes, and the live set can be cleared
+        # immediately. A packed int64 array pickles as one contiguous
+        # buffer, orders of magnitude cheaper than a set of Python ints.
+        cleared_indices = request_reply_stream.Prepickled(
+            np.fromiter(
+                self.__rpc_ctrl.training_buffer_indices,
+                dtype=np.int64,
+            )
+        )
+        self.__clear_data_cache_task = self.__event_loop.create_task(
+            group_rpc_blocked(
+                self.__reply_demux,
+                clear_handlers,
+                "clear_data_cache",
+                [cleared_indices for _ in clear_handlers],
+                verbose=False,
+            )
         )
         self.__rpc_ctrl.training_buffer_indices.clear()
 
@@ -1468,20 +1841,20 @@ class MasterWorker(worker_base.Worker):
 
     def experiment_complete_exit(self, msg: str):
         self.__rpc_ctrl.stop.set()
-        self.__asyncio_ctx.loop.stop()
+        self.__main_future.cancel()
         try:
-            teardown_run_util_complete(self.__asyncio_ctx)
-        except RuntimeError as e:
-            logger.info(
-                colorama.Style.RESET_ALL
-                + colorama.Fore.YELLOW
-                + colorama.Style.BRIGHT
-                + "\033[1m"
-                + msg
-                + colorama.Style.RESET_ALL
-            )
-            self.exit()
-            # raise ExperimentComplete(msg) from e
+            self.__event_loop.run_until_complete(self.__main_future)
+        except asyncio.CancelledError:
+            pass
+        logger.info(
+            colorama.Style.RESET_ALL
+            + colorama.Fore.YELLOW
+            + colorama.Style.BRIGHT
+            + "\033[1m"
+            + msg
+            + colorama.Style.RESET_ALL
+        )
+        self.exit()
 
     def __recover_save(self):
         # save step info for recover
@@ -1491,8 +1864,6 @@ class MasterWorker(worker_base.Worker):
             last_step_info=self.__last_step_info,
             hash_vals_to_ignore=self.__rpc_ctrl.used_hash_vals_this_epoch,
         )
-        import pprint
-
         logger.info("dumped recover info to file")
         pprint.pprint(recover_info.recover_start)
         pprint.pprint(recover_info.last_step_info)
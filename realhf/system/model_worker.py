@@ -906,13 +906,14 @@ class ModelWorker(worker_base.Worker):
             if r.handle_name == "ack":
                 self.__ack_cache[r.request_id] = r
             else:
-                self.__stream.post(
-                    request_reply_stream.Payload(
-                        handler="master",
-                        request_id=r.syn_reply_id,
-                        handle_name="syn",
-                    ),
-                )
+                if not r.no_syn:
+                    self.__stream.post(
+                        request_reply_stream.Payload(
+                            handler="master",
+                            request_id=r.syn_reply_id,
+                            handle_name="syn",
+                        ),
+                    )
                 self.__request_cache.append(r)
         except request_reply_stream.NoMessage:
             return
@@ -924,10 +925,13 @@ class ModelWorker(worker_base.Worker):
 
         while len(self.__request_cache) > 0:
             request: request_reply_stream.Payload = self.__request_cache[0]
-            while request.ack_reply_id not in self.__ack_cache:
-                self.__maybe_receive_one_request()
+            # Read-only requests skip the ordering handshake and are
+            # served on first receipt.
+            if not request.no_syn:
+                while request.ack_reply_id not in self.__ack_cache:
+                    self.__maybe_receive_one_request()
 
-            self.__ack_cache.pop(request.ack_reply_id)
+                self.__ack_cache.pop(request.ack_reply_id)
             self.__request_cache.pop(0)
 
             self.__request_queue.put_nowait((request, request.data, False, None))
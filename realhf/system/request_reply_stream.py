@@ -1,13 +1,12 @@
 # Request-reply stream between model workers and the master worker.
 # The stream is composed of a pair of ZMQ sockets, one PUSH and one PULL, for asynchronous communication,
 # i.e., the model worker can buffer requests from the master and execute them in any order under the hood.
-import asyncio
 import dataclasses
 import pickle
-import re
 import socket
 import time
 import uuid
+from collections import deque
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import zmq
@@ -18,6 +17,27 @@ from realhf.base import logging, name_resolve, names
 logger = logging.getLogger("Request-Replay Stream")
 ZMQ_IO_THREADS = 8
 
+
+def _send_pickled(socket: zmq.Socket, obj) -> None:
+    """Send an object with pickle protocol 5 out-of-band buffers.
+
+    Large contiguous buffers (e.g., numpy arrays inside payload data) are
+    emitted as separate ZMQ frames without an intermediate copy into the
+    pickle stream; small messages stay single-frame.
+    """
+    buffers: List[pickle.PickleBuffer] = []
+    header = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    if buffers:
+        socket.send_multipart([header, *buffers], copy=False)
+    else:
+        socket.send(header)
+
+
+def _recv_pickled(socket: zmq.Socket, flags: int = 0):
+    """Receive an object sent by :func:`_send_pickled`."""
+    frames = socket.recv_multipart(flags=flags)
+    return pickle.loads(frames[0], buffers=frames[1:])
+
 PUBSUB_BARRIER_NAME = "__pubsub_barrier__"
 
 
@@ -25,7 +45,28 @@ class NoMessage(Exception):
     pass
 
 
-@dataclasses.dataclass
+class Prepickled:
+    """An object serialized once for embedding in many payloads.
+
+    Sending the same large object (e.g., the buffer indices cleared after
+    each train step) to every model worker pickles it once per payload.
+    Wrapping it in this class snapshots the bytes up front, so each
+    payload pickle only copies them, and ``__reduce__`` makes unpickling
+    transparent: the receiver sees the original object.
+    """
+
+    __slots__ = ("bytes",)
+
+    def __init__(self, obj):
+        self.bytes = pickle.dumps(obj)
+
+    def __reduce__(self):
+        return (pickle.loads, (self.bytes,))
+
+
+# The master allocates payloads for every shard of every RPC each step;
+# slots cut the per-instance memory and allocation cost.
+@dataclasses.dataclass(slots=True)
 class Payload:
     handler: Union[system_api.ModelShardID, str]
     handle_name: str
@@ -34,6 +75,11 @@ class Payload:
     syn_reply_id: uuid.UUID = None
     ack_reply_id: uuid.UUID = None
 
+    # Read-only requests (e.g., the spec/model_config metadata fetches
+    # during initialization) do not need the syn-ack ordering handshake;
+    # workers serve them on first receipt, saving two round trips each.
+    no_syn: bool = False
+
     send_time: float = None
 
     # Non-tensor data
@@ -98,6 +144,8 @@ class NameResolvingRequstClient:
 
         self._response_buffer: Dict[uuid.UUID, Payload] = {}
         self._handler_routing = handler_routing
+        # Reusable shells for fire-and-forget acks; see post_acks.
+        self._ack_pool: List[Payload] = []
 
         # master needs to wait all peers (subscribers) to connect
         while (
@@ -129,74 +177,96 @@ class NameResolvingRequstClient:
         assert payload.request_id is not None and payload.handle_name is not None
         payload.send_time = time.monotonic()
         idx = self._handler_routing[payload.handler]
-        self.send_sockets[idx].send(pickle.dumps(payload))
+        _send_pickled(self.send_sockets[idx], payload)
         return payload.request_id
 
-    def poll(self, pattern: re.Pattern | None = None, block: bool = False) -> Payload:
-        payloads = self.poll_batch(pattern=pattern, block=block)
-        for p in payloads[1:]:
-            self._response_buffer[p.request_id] = p
-        return payloads[0]
+    def post_acks(
+        self, handler_id_pairs: List[Tuple[Any, uuid.UUID]]
+    ) -> None:
+        """Post a batch of acks from a reusable pool of payload shells.
+
+        Acks carry no data, so constructing (and uuid-stamping) a fresh
+        Payload per shard per RPC is pure allocation churn. Shells are
+        safe to reuse because sends serialize payloads before returning.
+        """
+        while len(self._ack_pool) < len(handler_id_pairs):
+            self._ack_pool.append(Payload(handler="", handle_name="ack"))
+        payloads = []
+        for shell, (handler, request_id) in zip(self._ack_pool, handler_id_pairs):
+            shell.handler = handler
+            shell.request_id = request_id
+            payloads.append(shell)
+        self.post_many(payloads)
+
+    def post_many(self, payloads: List[Payload]) -> List[uuid.UUID]:
+        """Post a batch of payloads with one send per destination socket.
+
+        Payloads routed to the same model worker are pickled together and
+        sent as a single multi-payload message, collapsing N small sends
+        into one and letting pickle memoize objects shared across payloads.
+        """
+        grouped: Dict[int, List[Payload]] = {}
+        send_time = time.monotonic()
+        for payload in payloads:
+            assert payload.request_id is not None and payload.handle_name is not None
+            payload.send_time = send_time
+            grouped.setdefault(self._handler_routing[payload.handler], []).append(
+                payload
+            )
+        for idx, batch in grouped.items():
+            _send_pickled(self.send_sockets[idx], batch)
+        return [p.request_id for p in payloads]
 
-    def poll_batch(
-        self, pattern: re.Pattern | None = None, block: bool = False
-    ) -> List[Payload]:
-        """Collect responses that match some pattern from the stream.
+    def pump(self) -> List[uuid.UUID]:
+        """Drain the receive socket into the response buffer without matching.
 
-        This function may NOT actually pull from the stream. It may fetch something
-        from the buffer, which records mismatched responses.
+        Returns the request ids of newly received payloads. Used by the
+        master's event-driven reply dispatcher, which matches responses
+        against pending futures instead of polling with patterns.
+        """
+        new_ids = []
+        while True:
+            try:
+                payload: Payload = _recv_pickled(self.recv_socket, flags=zmq.NOBLOCK)
+            except zmq.ZMQError:
+                break
+            self._response_buffer[payload.request_id] = payload
+            new_ids.append(payload.request_id)
+        return new_ids
+
+    def try_pop(self, request_id: uuid.UUID) -> Optional[Payload]:
+        """Pop a buffered response by exact request id, if present."""
+        return self._response_buffer.pop(request_id, None)
+
+    def poll(
+        self, match_id: Optional[uuid.UUID] = None, block: bool = False
+    ) -> Payload:
+        """Collect a response from the stream.
+
+        This function may NOT actually pull from the stream. It may fetch
+        something from the buffer, which records mismatched responses.
 
         Args:
-            pattern (Optional[re.Pattern], optional): Only responses with this
-                specific regex pattern will be returned.
-                None means no pattern specified. Defaults to None.
+            match_id (Optional[uuid.UUID], optional): Only the response with
+                this exact request id will be returned.
+                None means any response. Defaults to None.
             block (bool, optional): Whether to block to receive a
-                response (with the given pattern). Defaults to False.
+                response (with the given id). Defaults to False.
         """
-        if not block:
-            return self._poll_batch_nonblock(pattern)
-        else:
-            while True:
-                try:
-                    return self._poll_batch_nonblock(pattern)
-                except NoMessage:
-                    time.sleep(0.05)
-
-    def _poll_batch_nonblock(
-        self, pattern: Optional[re.Pattern] = None
-    ) -> List[Payload]:
-        # Check whether there's response in the buffer.
-        # If so, return immediately.
-        if pattern is None:
-            pattern = re.compile(".*")
-
-        payloads = []
-        for req_id, p in self._response_buffer.items():
-            if pattern.match(str(req_id)):
-                payloads.append(p)
-        for p in payloads:
-            self._response_buffer.pop(p.request_id)
-        if len(payloads) > 0:
-            return payloads
-
-        # Otherwise, pull from the socket.
-        try:
-            p_bytes = self.recv_socket.recv(flags=zmq.NOBLOCK)
-        except zmq.ZMQError:
-            raise NoMessage()
-        payload: Payload = pickle.loads(p_bytes)
-        # logger.info(f"Payload transfer time: {time.monotonic() - payload.send_time:.4f}s")
-        self._response_buffer[payload.request_id] = payload
-
-        payloads = []
-        for req_id, p in self._response_buffer.items():
-            if pattern.match(str(req_id)):
-                payloads.append(p)
-        for p in payloads:
-            self._response_buffer.pop(p.request_id)
-        if len(payloads) > 0:
-            return payloads
-        raise NoMessage()
+        while True:
+            self.pump()
+            if match_id is None:
+                if self._response_buffer:
+                    return self._response_buffer.pop(
+                        next(iter(self._response_buffer))
+                    )
+            else:
+                payload = self._response_buffer.pop(match_id, None)
+                if payload is not None:
+                    return payload
+            if not block:
+                raise NoMessage()
+            time.sleep(0.05)
 
 
 class NameResolvingReplyServer:
@@ -238,6 +308,7 @@ class NameResolvingReplyServer:
         )
 
     def accept(self, server_send_addr: str, server_recv_addr: str):
+        self._recv_buffer: deque = deque()
         recv_socket: zmq.Socket = self.context.socket(zmq.PULL)
         recv_socket.connect(f"tcp://{server_send_addr}")
         recv_socket.setsockopt(zmq.LINGER, 0)
@@ -251,17 +322,22 @@ class NameResolvingReplyServer:
     def post(self, payload: Payload) -> uuid.UUID:
         assert payload.request_id is not None and payload.handle_name is not None
         payload.send_time = time.monotonic()
-        self.send_socket.send(pickle.dumps(payload))
+        _send_pickled(self.send_socket, payload)
         return payload.request_id
 
     def poll(self, block: bool = False) -> Payload:
+        if self._recv_buffer:
+            return self._recv_buffer.popleft()
         try:
-            payload_bytes = self.recv_socket.recv(flags=0 if block else zmq.NOBLOCK)
+            payload = _recv_pickled(self.recv_socket, flags=0 if block else zmq.NOBLOCK)
         except zmq.ZMQError:
             raise NoMessage()
 
-        payload: Payload = pickle.loads(payload_bytes)
         # logger.debug(f"Payload transfer time: {time.monotonic() - payload.send_time:.4f}s")
+        if isinstance(payload, list):
+            # A batched send from the master (see post_many).
+            self._recv_buffer.extend(payload)
+            return self._recv_buffer.popleft()
         return payload
 
     def close(self):